@@ -14,43 +14,159 @@ Refer to the NOTICE.txt file for dependencies and third-party libraries used.
 """
 
 import argparse
+import copy
 import os
 import json
 import sys
+import tempfile
+import threading
 import traceback
 import concurrent.futures # For parallel processing
+import itertools
+from dataclasses import dataclass, fields
 from pathlib import Path # Ensure Path is imported here as it's used widely
-from typing import List, Tuple, Optional, Dict, Any
-from . import pdf2pic
-from . import pic2text
+from typing import List, Tuple, Optional, Dict, Any, Callable, Sequence
 from . import perf_tuner
-from . import text2anki
+
+# pdf2pic (PyMuPDF, Pillow), pic2text (requests) and text2anki (genanki) are
+# imported inside the handlers that need them, so `pdf2anki --help` and the
+# config commands don't pay for them. Module attribute access such as
+# `pdf2anki.core.pic2text` still works through __getattr__ below.
+_LAZY_SUBMODULES = frozenset({"pdf2pic", "pic2text", "text2anki"})
+
+# Mirrors pic2text.DEFAULT_MAX_IMAGE_KB for --help texts; --max-image-kb itself
+# defaults to None and is resolved against pic2text at run time.
+_DEFAULT_MAX_IMAGE_KB_HELP = 800
+
+# Mirrors the keys of pdf2pic.PAGE_IMAGE_FORMATS for --image-format choices.
+_IMAGE_FORMAT_CHOICES = ("png", "webp", "jpeg")
+
+# Judge modes pic2text implements (anything else falls back to authoritative).
+_JUDGE_MODE_CHOICES = ("authoritative",)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        module = importlib.import_module(f".{name}", __package__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Configuration Management ---
 
+# orjson is optional: when installed it parses/serialises config bytes in C.
+# Its JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    return _orjson.loads(data) if _orjson is not None else json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Indented UTF-8 JSON, byte-identical with and without orjson."""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+# "[<pid>]" prefix for worker-visible messages. Forked children do not
+# re-import this module, so the tag is refreshed in the child after fork.
+_PID_TAG = f"[{os.getpid()}]"
+
+
+def _refresh_pid_tag() -> None:
+    global _PID_TAG
+    _PID_TAG = f"[{os.getpid()}]"
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid_tag)
+
 CONFIG_DIR = Path.home() / ".pdf2anki"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
+# Parsed config keyed by (path, mtime_ns, size). One command calls
+# load_config() several times (presets, Anki model, batch dispatch); the file
+# is parsed once and re-read only after it changed on disk. Callers get a deep
+# copy, so mutating the returned dict never leaks into the cache.
+_config_cache: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
+_config_cache_lock = threading.Lock()
+
+
+def _read_with_stat(path: Path) -> Tuple[bytes, os.stat_result]:
+    """Whole file via one descriptor: raw os.read() calls sized by its fstat()."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0))
+    try:
+        st = os.fstat(fd)
+        chunks = []
+        while chunk := os.read(fd, max(st.st_size, 4096)):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return b"".join(chunks), st
+
+
 def load_config() -> Dict[str, Any]:
     """Loads configuration from the JSON file."""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            print(f"[WARN] Could not read config file at {CONFIG_FILE}. Using empty config.")
-            return {}
-    return {}
+    global _config_cache
+    try:
+        st = CONFIG_FILE.stat()
+    except OSError:
+        # No config yet: make sure its directory exists for a later save.
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        return {}
+    cache_key = (str(CONFIG_FILE), st.st_mtime_ns, st.st_size)
+    with _config_cache_lock:
+        if _config_cache is not None and _config_cache[0] == cache_key:
+            return copy.deepcopy(_config_cache[1])
+    try:
+        data, st = _read_with_stat(CONFIG_FILE)
+        # An empty file (e.g. just touched) means "no settings", not a broken config.
+        config = _json_loads(data) if data.strip() else {}
+    except (ValueError, OSError):  # JSONDecodeError and UnicodeDecodeError are ValueErrors
+        print(f"[WARN] Could not read config file at {CONFIG_FILE}. Using empty config.")
+        return {}
+    # Key the cache on the stat of the descriptor actually read, so an edit
+    # racing with this load can never be cached under the older key.
+    cache_key = (str(CONFIG_FILE), st.st_mtime_ns, st.st_size)
+    with _config_cache_lock:
+        _config_cache = (cache_key, config)
+    return copy.deepcopy(config)
 
 def save_config(config: Dict[str, Any]) -> None:
-    """Saves configuration to the JSON file."""
+    """Saves configuration to the JSON file.
+
+    Writes a temp file and os.replace()s it over the old one, so a crash or a
+    concurrent invocation never leaves a truncated config.json behind. An
+    unchanged config is not rewritten.
+    """
+    global _config_cache
+    data = _json_dumps(config)
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
-    except IOError:
+        if CONFIG_FILE.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    tmp_path = CONFIG_FILE.with_name(f"{CONFIG_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, CONFIG_FILE)
+    except OSError:
         print(f"[ERROR] Could not write config file to {CONFIG_FILE}.")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    with _config_cache_lock:
+        _config_cache = None
 
 def get_default_model(config: Dict[str, Any], interactive: bool = True) -> Optional[str]:
     """
@@ -66,7 +182,7 @@ def get_default_model(config: Dict[str, Any], interactive: bool = True) -> Optio
         if not sys.stdin.isatty():
             # Non-interactive session (e.g., script piped or a worker process if called directly)
             # This part is more of a safeguard; model resolution should happen before workers.
-            print(f"[{os.getpid() if hasattr(os, 'getpid') else 'main'}] INFO: get_default_model called in non-interactive mode and no default_model is set in config.")
+            print(f"{_PID_TAG} INFO: get_default_model called in non-interactive mode and no default_model is set in config.")
             return None
 
         print("No default OCR model set in configuration.")
@@ -97,7 +213,7 @@ def get_default_anki_model(config: Dict[str, Any], interactive: bool = True) ->
         return config["default_anki_model"]
     if interactive:
         if not sys.stdin.isatty():
-            print(f"[{os.getpid() if hasattr(os, 'getpid') else 'main'}] INFO: get_default_anki_model called in non-interactive mode and no default_anki_model is set.")
+            print(f"{_PID_TAG} INFO: get_default_anki_model called in non-interactive mode and no default_anki_model is set.")
             return None
         print("No default Anki generation model set in configuration.")
         try:
@@ -136,36 +252,52 @@ def get_preset_defaults(config: Dict[str, Any]) -> Dict[str, Any]:
 # --- End Configuration Management ---
 
 
+def _parse_rect(value: str) -> Tuple[int, int, int, int]:
+    """argparse `type=` for crop rectangles: reject bad input before any rendering starts."""
+    from . import pdf2pic
+    try:
+        return pdf2pic.parse_rectangle(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _debug(args: argparse.Namespace, msg: str, *fmt_args: Any) -> None:
+    """Print a --verbose-only trace line; nothing is formatted when verbose is off."""
+    if getattr(args, 'verbose', False):
+        print(f"{_PID_TAG} {msg % fmt_args if fmt_args else msg}")
+
+
 def pdf_to_images(args: argparse.Namespace) -> None:
     """
     Convert a PDF file into a sequence of images, optionally cropping.
     Passes verbose flag down.
     """
-    pid_str = f"[{os.getpid() if hasattr(os, 'getpid') else 'main'}]"
-    if getattr(args, 'verbose', False):
-        print(f"{pid_str} pdf_to_images called for: {args.pdf_path}")
+    from . import pdf2pic
+    _debug(args, "pdf_to_images called for: %s", args.pdf_path)
 
-    parsed_rectangles = []
-    for rect_str in args.rectangles:
-        parsed_rectangles.append(pdf2pic.parse_rectangle(rect_str))
+    # The CLI already parsed rectangles (type=_parse_rect); strings still come
+    # from programmatic callers.
+    rectangles = [pdf2pic.parse_rectangle(r) if isinstance(r, str) else r for r in args.rectangles]
 
     pdf2pic.convert_pdf_to_images(
         pdf_path=args.pdf_path,
         output_dir=args.output_dir,
-        rectangles=parsed_rectangles,
+        rectangles=rectangles,
         verbose=getattr(args, 'verbose', False),
-        resume_existing=getattr(args, 'resume_existing', False)
+        resume_existing=getattr(args, 'resume_existing', False),
+        image_format=getattr(args, 'image_format', 'png'),
+        render_workers=getattr(args, 'render_workers', 1),
+        emit_recrop_pdf=getattr(args, 'recrop_pdf', False),
     )
-    if getattr(args, 'verbose', False):
-        print(f"{pid_str} pdf_to_images completed for: {args.pdf_path}")
+    _debug(args, "pdf_to_images completed for: %s", args.pdf_path)
 
 
-_IMAGE_EXTS = ('.png', '.jpg', '.jpeg')
+_IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
 _PARSER_OCR_DEFAULTS = {
     'model': [], 'repeat': [], 'judge_model': None,
     'judge_mode': 'authoritative', 'judge_with_image': False,
     'no_resume': False, 'max_page_attempts': 40,
-    'max_image_kb': pic2text.DEFAULT_MAX_IMAGE_KB,
+    'max_image_kb': None,
 }
 
 
@@ -176,21 +308,12 @@ def _apply_ocr_presets_and_resolve_model(args: argparse.Namespace, config: Dict[
     Must run on the main thread (may prompt stdin).
     """
     preset_defaults = get_preset_defaults(config)
-    temp_parser = argparse.ArgumentParser()
-    for key, val in _PARSER_OCR_DEFAULTS.items():
-        temp_parser.add_argument(
-            f"--{key.replace('_', '-')}",
-            default=val,
-            action='append' if isinstance(val, list) else 'store',
-        )
-    parser_defaults_ns = temp_parser.parse_args([])
 
     print("[INFO] Applying settings. Priority: CLI > Presets > Global Default > Prompt.")
     for key, preset_val in preset_defaults.items():
         if key in _PARSER_OCR_DEFAULTS:
             cli_value = getattr(args, key, None)
-            parser_default_value = getattr(parser_defaults_ns, key)
-            if cli_value == parser_default_value:
+            if cli_value == _PARSER_OCR_DEFAULTS[key]:
                 setattr(args, key, preset_val)
                 print(f"[INFO] Using preset for --{key.replace('_', '-')}: {preset_val}")
 
@@ -224,6 +347,7 @@ def _preflight_validate_models(args: argparse.Namespace) -> None:
     validation is skipped with a warning. Disable entirely via
     PDF2ANKI_SKIP_MODEL_VALIDATION=1.
     """
+    from . import pic2text
     if os.getenv("PDF2ANKI_SKIP_MODEL_VALIDATION", "").strip() in ("1", "true", "True"):
         return
 
@@ -272,44 +396,209 @@ def _find_image_subdirs(path: Path) -> List[Path]:
     return [d for d in candidates if _dir_has_top_level_images(d)]
 
 
-def _run_single_dir_ocr(args: argparse.Namespace) -> None:
-    """Run OCR on one flat images_dir. Expects args.model already resolved."""
-    pid_str = f"[{os.getpid() if hasattr(os, 'getpid') else 'main'}]"
-    remaining_model_repeats: List[Tuple[str, int]] = []
-    for idx, model_name in enumerate(args.model):
-        rp = 1
-        if args.repeat and idx < len(args.repeat):
-            rp = args.repeat[idx]
-        remaining_model_repeats.append((model_name, rp))
+def _list_pdfs(path: Path) -> List[Path]:
+    """Sorted regular *.pdf files (any case) directly inside path.
+
+    os.scandir reports the entry type from the directory listing itself, so
+    large folders need no stat() per file.
+    """
+    with os.scandir(path) as entries:
+        return sorted(
+            Path(e.path) for e in entries
+            if e.name.lower().endswith('.pdf') and e.is_file()
+        )
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (affinity mask, e.g. taskset/cgroup cpusets).
+
+    os.cpu_count() reports every core of the machine, which oversizes pools
+    inside pinned containers. Falls back to it where affinity is unsupported.
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def _batch_worker_count(num_items: int, jobs: Optional[int] = None) -> Tuple[int, str]:
+    """(workers, source) for a batch; never more workers than items.
+
+    --jobs wins, then env PDF2ANKI_WORKERS, then 0.6 x CPU cores. The default
+    stays below the core count because each worker renders pages (CPU) and
+    already overlaps the network-bound OCR with its own page thread pool.
+    """
+    if jobs is not None:
+        count, source = jobs, "--jobs"
+    else:
+        raw = os.environ.get("PDF2ANKI_WORKERS", "").strip()
+        count = int(raw) if raw.isdigit() else 0
+        source = "PDF2ANKI_WORKERS"
+        if count < 1:
+            count, source = max(1, int(available_cpus() * 0.6)), "auto: 0.6 x CPU cores"
+    return max(1, min(num_items, count)), source
+
+
+def _batch_executor_class(choice: str = "auto") -> type:
+    """Pool class for pic2text's batch mode (--executor).
+
+    auto -> threads: each job is remote OCR (blocking HTTP; Pillow's JPEG
+    encoding releases the GIL) and never touches PyMuPDF, so processes only
+    add spawn and pickling cost. pdf2text always uses processes because its
+    workers render with PyMuPDF, which is not thread-safe.
+    """
+    if choice == "process":
+        return concurrent.futures.ProcessPoolExecutor
+    return concurrent.futures.ThreadPoolExecutor
+
+
+def _build_model_repeats(models: Optional[Sequence[str]], repeats: Optional[Sequence[int]]) -> List[Tuple[str, int]]:
+    """Pair each --model with its --repeat (by position); missing repeats default to 1."""
+    models = models or []
+    return list(itertools.zip_longest(models, (repeats or [])[:len(models)], fillvalue=1))
+
+
+# Optional OCR flags that programmatic callers may leave off their namespace.
+_PIC2TEXT_ARG_DEFAULTS: Dict[str, Any] = {
+    'no_resume': False, 'max_page_attempts': 40, 'max_concurrent_pages': None,
+    'max_image_kb': None, 'no_cache': False, 'cache_dir': None, 'verbose': False,
+}
+
+
+def _make_pic2text_args(images_dir: str, output_file: str, args: argparse.Namespace) -> argparse.Namespace:
+    """Namespace for _run_single_dir_ocr from already-resolved OCR args (model must be set).
+
+    Copies every field of `args` (so new OCR flags travel along without
+    being listed here) and only swaps in the target directory and file.
+    """
+    return argparse.Namespace(**{
+        **_PIC2TEXT_ARG_DEFAULTS, **vars(args),
+        'images_dir': images_dir, 'output_file': output_file,
+    })
+
+
+def _text_layer_pages_for(pdf_path: str, args: argparse.Namespace) -> Optional[Dict[int, str]]:
+    """Pages of pdf_path whose text layer makes OCR unnecessary, per --ocr-threshold."""
+    threshold = getattr(args, 'ocr_threshold', 0) or 0
+    if threshold <= 0 or getattr(args, 'rectangles', None):
+        return None
+    from . import pdf2pic
+    pages = pdf2pic.extract_text_layer(pdf_path, threshold)
+    _debug(args, "Text layer usable on %d page(s) of %s", len(pages), Path(pdf_path).name)
+    return pages
+
+
+def run_pic2text(
+    *,
+    images_dir: str,
+    output_file: str,
+    models: Sequence[str],
+    repeats: Optional[Sequence[int]] = None,
+    judge_model: Optional[str] = None,
+    judge_mode: str = "authoritative",
+    ensemble_strategy: Optional[str] = None,
+    trust_score: Optional[float] = None,
+    judge_with_image: bool = False,
+    no_resume: bool = False,
+    max_page_attempts: int = 40,
+    max_concurrent_pages: Optional[int] = None,
+    max_image_kb: Optional[int] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    text_layer_pages: Optional[Dict[int, str]] = None,
+    verbose: bool = False,
+) -> None:
+    """Run OCR on one flat images_dir with already-resolved models (no argparse involved)."""
+    from . import pic2text
+    remaining_model_repeats = _build_model_repeats(models, repeats)
 
     if not remaining_model_repeats:
-        raise ValueError(f"{pid_str} _run_single_dir_ocr: No models/repeats configured.")
+        raise ValueError(f"{_PID_TAG} run_pic2text: No models/repeats configured.")
 
-    explicit_concurrency = getattr(args, 'max_concurrent_pages', None)
     primary_model = remaining_model_repeats[0][0]
-    resolved_concurrency = perf_tuner.resolve_concurrency(primary_model, explicit_concurrency)
-    if explicit_concurrency is None and not perf_tuner.is_disabled():
-        print(f"{pid_str} [TUNER] max_concurrent_pages={resolved_concurrency} for {primary_model}")
+    resolved_concurrency = perf_tuner.resolve_concurrency(primary_model, max_concurrent_pages)
+    if perf_tuner.tuner_decides(max_concurrent_pages):
+        print(f"{_PID_TAG} [TUNER] max_concurrent_pages={resolved_concurrency} for {primary_model}")
 
     pic2text.convert_images_to_text(
-        images_dir=args.images_dir,
-        output_file=args.output_file,
+        images_dir=images_dir,
+        output_file=output_file,
         model_repeats=remaining_model_repeats,
-        judge_model=args.judge_model,
-        judge_mode=args.judge_mode,
-        ensemble_strategy=args.ensemble_strategy,
-        trust_score=args.trust_score,
-        judge_with_image=args.judge_with_image,
-        no_resume=getattr(args, 'no_resume', False),
-        max_page_attempts=getattr(args, 'max_page_attempts', 40),
-        verbose=getattr(args, 'verbose', False),
+        judge_model=judge_model,
+        judge_mode=judge_mode,
+        ensemble_strategy=ensemble_strategy,
+        trust_score=trust_score,
+        judge_with_image=judge_with_image,
+        no_resume=no_resume,
+        max_page_attempts=max_page_attempts,
+        verbose=verbose,
         max_concurrent_pages=resolved_concurrency,
-        max_image_kb=getattr(args, 'max_image_kb', pic2text.DEFAULT_MAX_IMAGE_KB),
+        max_image_kb=pic2text.DEFAULT_MAX_IMAGE_KB if max_image_kb is None else max_image_kb,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        text_layer_pages=text_layer_pages,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class OCRSettings:
+    """Resolved OCR options, built once from the CLI namespace.
+
+    Field names are run_pic2text's keyword arguments, so
+    `run_pic2text(images_dir=..., output_file=..., **settings.as_kwargs())`.
+    """
+    models: Tuple[str, ...]
+    repeats: Tuple[int, ...] = ()
+    judge_model: Optional[str] = None
+    judge_mode: str = "authoritative"
+    ensemble_strategy: Optional[str] = None
+    trust_score: Optional[float] = None
+    judge_with_image: bool = False
+    no_resume: bool = False
+    max_page_attempts: int = 40
+    max_concurrent_pages: Optional[int] = None
+    max_image_kb: Optional[int] = None
+    use_cache: bool = True
+    cache_dir: Optional[str] = None
+    verbose: bool = False
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "OCRSettings":
+        """Map resolved CLI OCR options (after presets) onto settings."""
+        return cls(
+            models=tuple(args.model or ()),
+            repeats=tuple(args.repeat or ()),
+            judge_model=args.judge_model,
+            judge_mode=args.judge_mode,
+            ensemble_strategy=args.ensemble_strategy,
+            trust_score=args.trust_score,
+            judge_with_image=args.judge_with_image,
+            no_resume=getattr(args, 'no_resume', False),
+            max_page_attempts=getattr(args, 'max_page_attempts', 40),
+            max_concurrent_pages=getattr(args, 'max_concurrent_pages', None),
+            max_image_kb=getattr(args, 'max_image_kb', None),
+            use_cache=not getattr(args, 'no_cache', False),
+            cache_dir=getattr(args, 'cache_dir', None),
+            verbose=getattr(args, 'verbose', False),
+        )
+
+    def as_kwargs(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+def _run_single_dir_ocr(args: argparse.Namespace) -> None:
+    """Run OCR on one flat images_dir. Expects args.model already resolved."""
+    run_pic2text(
+        images_dir=args.images_dir,
+        output_file=args.output_file,
+        text_layer_pages=getattr(args, 'text_layer_pages', None),
+        **OCRSettings.from_args(args).as_kwargs(),
     )
 
 
 def _process_image_dir_worker(subdir_str: str, common_args_dict: dict, output_base_dir_str: str) -> str:
     """Worker that OCRs one image subdirectory into {output_base_dir}/{subdir.name}.txt."""
+    from . import pic2text
     worker_args = argparse.Namespace(**common_args_dict)
     subdir = Path(subdir_str)
     pid = os.getpid()
@@ -338,9 +627,8 @@ def images_to_text(args: argparse.Namespace) -> None:
     subdirectories that themselves hold images, treat each subdir as one document
     and process them in parallel (mirrors pdf2text's dir-of-PDFs batch mode).
     """
-    pid_str = f"[{os.getpid() if hasattr(os, 'getpid') else 'main'}]"
-    if getattr(args, 'verbose', False):
-        print(f"{pid_str} images_to_text (core wrapper) called for dir: {args.images_dir}")
+    from . import pic2text
+    _debug(args, "images_to_text (core wrapper) called for dir: %s", args.images_dir)
 
     input_path = Path(args.images_dir)
     if not input_path.is_dir():
@@ -371,12 +659,13 @@ def images_to_text(args: argparse.Namespace) -> None:
             f"[INFO] pic2text batch mode: {len(image_subdirs)} image subdirectories in "
             f"'{args.images_dir}'. Output → '{output_base_dir}/<subdir>.txt'."
         )
-        cpu_cores = os.cpu_count() or 1
-        num_workers = min(len(image_subdirs), max(1, int(cpu_cores * 0.6)))
-        print(f"[INFO] Using up to {num_workers} parallel worker processes.")
+        num_workers, workers_source = _batch_worker_count(len(image_subdirs), getattr(args, 'jobs', None))
+        executor_cls = _batch_executor_class(getattr(args, 'executor', 'auto'))
+        worker_kind = "processes" if executor_cls is concurrent.futures.ProcessPoolExecutor else "threads"
+        print(f"[INFO] Using up to {num_workers} parallel worker {worker_kind} ({workers_source}).")
 
         common_args_dict = vars(args).copy()
-        common_args_dict.pop('func', None)
+        common_args_dict.pop('func_name', None)
 
         success_count = 0
         failure_count = 0
@@ -384,7 +673,7 @@ def images_to_text(args: argparse.Namespace) -> None:
         pause_detected = False
         results_summary: List[str] = []
 
-        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        with executor_cls(max_workers=num_workers) as executor:
             future_to_subdir = {
                 executor.submit(
                     _process_image_dir_worker, str(subdir), common_args_dict, str(output_base_dir)
@@ -437,16 +726,42 @@ def images_to_text(args: argparse.Namespace) -> None:
         print(f"[INFO] No output file specified. Defaulting to: {args.output_file}")
 
     _run_single_dir_ocr(args)
-    if getattr(args, 'verbose', False):
-        print(f"{pid_str} images_to_text (core wrapper) completed for dir: {args.images_dir}")
+    _debug(args, "images_to_text (core wrapper) completed for dir: %s", args.images_dir)
+
 
+def _batch_output_dirs(args: argparse.Namespace) -> Tuple[str, str]:
+    """(image root, text dir) for non-recursive pdf2text batch mode.
 
-def _process_pdf_worker(pdf_file_path_str: str, common_args_dict: dict) -> str:
+    Images go to <output_dir or ./pdf2pic>/<stem>/, texts to
+    <output_file or .>/<stem>.txt (a file-like output_file means its parent).
+    """
+    base_image_dir = Path(args.output_dir) if args.output_dir else Path.cwd() / "pdf2pic"
+    base_text_dir = Path(args.output_file) if args.output_file else Path.cwd()
+    if base_text_dir.suffix and base_text_dir.parent != Path('.'):
+        base_text_dir = base_text_dir.parent
+    return str(base_image_dir), str(base_text_dir)
+
+
+# Shared pdf2text settings, installed once per worker process by the pool
+# initializer so they are pickled per worker rather than per submitted PDF.
+_pdf_worker_common_args: Optional[dict] = None
+
+
+def _init_pdf_worker(common_args_dict: dict) -> None:
+    global _pdf_worker_common_args
+    _pdf_worker_common_args = common_args_dict
+
+
+def _process_pdf_worker(pdf_file_path_str: str, common_args_dict: Optional[dict] = None) -> str:
     """
     Worker function to process a single PDF file.
     This function is executed in a separate process.
-    `common_args_dict` should have `model` already resolved.
+    `common_args_dict` should have `model` already resolved; pool workers omit it
+    and use the settings installed by `_init_pdf_worker`.
     """
+    from . import pic2text
+    if common_args_dict is None:
+        common_args_dict = _pdf_worker_common_args
     worker_args = argparse.Namespace(**common_args_dict)
     pdf_path = Path(pdf_file_path_str)
     pid = os.getpid()
@@ -466,52 +781,36 @@ def _process_pdf_worker(pdf_file_path_str: str, common_args_dict: dict) -> str:
             # pick up folders that were processed the old, manual way.
             current_image_output_dir = pdf_path.parent / "pdf2pic" / pdf_name_stem
             current_text_output_file = pdf_path.parent / f"{pdf_name_stem}.txt"
+        elif is_batch_mode:
+            # Shared output roots are resolved (and created) once by pdf_to_text.
+            base_image_dir, base_text_dir = common_args_dict['_batch_output_dirs']
+            current_image_output_dir = Path(base_image_dir) / pdf_name_stem
+            current_text_output_file = Path(base_text_dir) / f"{pdf_name_stem}.txt"
         else:
-            # Image output directory
-            if is_batch_mode:
-                base_image_dir = Path(worker_args.output_dir) if worker_args.output_dir else Path.cwd() / "pdf2pic"
-                current_image_output_dir = base_image_dir / pdf_name_stem
-            else:
-                current_image_output_dir = Path(worker_args.output_dir) if worker_args.output_dir else Path.cwd() / "pdf2pic" / pdf_name_stem
-
-            # Text output file
-            if is_batch_mode:
-                base_text_dir = Path(worker_args.output_file) if worker_args.output_file else Path.cwd()
-                if base_text_dir.suffix and base_text_dir.parent != Path('.'):
-                    base_text_dir = base_text_dir.parent
-                current_text_output_file = base_text_dir / f"{pdf_name_stem}.txt"
-            else:
-                current_text_output_file = Path(worker_args.output_file) if worker_args.output_file else Path.cwd() / f"{pdf_name_stem}.txt"
+            current_image_output_dir = Path(worker_args.output_dir) if worker_args.output_dir else Path.cwd() / "pdf2pic" / pdf_name_stem
+            current_text_output_file = Path(worker_args.output_file) if worker_args.output_file else Path.cwd() / f"{pdf_name_stem}.txt"
 
         current_image_output_dir.mkdir(parents=True, exist_ok=True)
-        current_text_output_file.parent.mkdir(parents=True, exist_ok=True)
+        if not is_batch_mode:
+            current_text_output_file.parent.mkdir(parents=True, exist_ok=True)
 
         pdf_to_images_args = argparse.Namespace(
             pdf_path=str(pdf_path),
             output_dir=str(current_image_output_dir),
             rectangles=worker_args.rectangles,
             resume_existing=not getattr(worker_args, 'no_resume', False),
+            image_format=getattr(worker_args, 'image_format', 'png'),
+            render_workers=getattr(worker_args, 'render_workers', 1),
+            recrop_pdf=getattr(worker_args, 'recrop_pdf', False),
             verbose=getattr(worker_args, 'verbose', False)
         )
         
         # `worker_args.model` is passed here, which was resolved in the main thread.
         # Bypass images_to_text's dispatcher since we already know the single-dir shape.
-        images_to_text_args = argparse.Namespace(
-            images_dir=str(current_image_output_dir),
-            output_file=str(current_text_output_file),
-            model=worker_args.model, # This is crucial - model is pre-resolved
-            repeat=worker_args.repeat,
-            judge_model=worker_args.judge_model,
-            judge_mode=worker_args.judge_mode,
-            ensemble_strategy=worker_args.ensemble_strategy,
-            trust_score=worker_args.trust_score,
-            judge_with_image=worker_args.judge_with_image,
-            no_resume=getattr(worker_args, 'no_resume', False),
-            max_page_attempts=getattr(worker_args, 'max_page_attempts', 40),
-            max_concurrent_pages=getattr(worker_args, 'max_concurrent_pages', None),
-            max_image_kb=getattr(worker_args, 'max_image_kb', pic2text.DEFAULT_MAX_IMAGE_KB),
-            verbose=getattr(worker_args, 'verbose', False)
+        images_to_text_args = _make_pic2text_args(
+            str(current_image_output_dir), str(current_text_output_file), worker_args
         )
+        images_to_text_args.text_layer_pages = _text_layer_pages_for(str(pdf_path), worker_args)
 
         pdf_to_images(pdf_to_images_args)
         _run_single_dir_ocr(images_to_text_args)
@@ -553,8 +852,8 @@ def pdf_to_text(args: argparse.Namespace) -> None:
 
     if input_path.is_dir():
         is_batch_mode = True
-        pdf_files_to_process = sorted(
-            input_path.rglob("*.pdf") if recursive else input_path.glob("*.pdf")
+        pdf_files_to_process = (
+            sorted(input_path.rglob("*.pdf")) if recursive else _list_pdfs(input_path)
         )
         if recursive:
             # Never re-ingest our own artifacts: pdf2pic/ holds rendered pages and
@@ -589,13 +888,18 @@ def pdf_to_text(args: argparse.Namespace) -> None:
     _apply_ocr_presets_and_resolve_model(args, config)
 
     common_args_dict = vars(args).copy()
+    common_args_dict.pop('func_name', None)
     common_args_dict['_is_batch_mode'] = is_batch_mode
     common_args_dict['_is_recursive'] = recursive
+    if is_batch_mode and not recursive:
+        output_dirs = _batch_output_dirs(args)
+        for out_dir in output_dirs:
+            Path(out_dir).mkdir(parents=True, exist_ok=True)
+        common_args_dict['_batch_output_dirs'] = output_dirs
 
     if is_batch_mode and len(pdf_files_to_process) > 1:
-        cpu_cores = os.cpu_count() or 1
-        num_workers = min(len(pdf_files_to_process), max(1, int(cpu_cores * 0.6)))
-        print(f"[INFO] Detected {cpu_cores} CPU cores. Using up to {num_workers} parallel worker processes.")
+        num_workers, workers_source = _batch_worker_count(len(pdf_files_to_process), getattr(args, 'jobs', None))
+        print(f"[INFO] Detected {os.cpu_count() or 1} CPU cores ({available_cpus()} usable). Using up to {num_workers} parallel worker processes ({workers_source}).")
 
         success_count = 0
         failure_count = 0
@@ -603,9 +907,11 @@ def pdf_to_text(args: argparse.Namespace) -> None:
         pause_detected = False
         results_summary = []
 
-        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_pdf_worker, initargs=(common_args_dict,)
+        ) as executor:
             future_to_pdf = {
-                executor.submit(_process_pdf_worker, str(pdf_path), common_args_dict): pdf_path
+                executor.submit(_process_pdf_worker, str(pdf_path)): pdf_path
                 for pdf_path in pdf_files_to_process
             }
             completed_workers = 0
@@ -666,22 +972,35 @@ def _run_workflow(workflow_args: list) -> None:
         sys.argv = original_argv
 
 
-def text_to_anki(args: argparse.Namespace) -> None:
+def _workflow_command(args: argparse.Namespace) -> None:
+    _run_workflow(args.workflow_args)
+
+
+def _resolve_anki_model(args: argparse.Namespace, config: Dict[str, Any], command: str) -> str:
+    """args.anki_model, else the configured (or prompted) default; exits if neither.
+
+    Must run on the main thread (may prompt stdin).
+    """
+    if args.anki_model:
+        return args.anki_model
+    default_anki_model = get_default_anki_model(config, interactive=True)
+    if not default_anki_model:
+        print(f"[ERROR] No Anki model specified for '{command}' and no 'default_anki_model' configured/provided.")
+        print("  Use the anki_model argument or set 'default_anki_model' via 'pdf2anki config set default_anki_model <name>'.")
+        sys.exit(1)
+    print(f"[INFO] Using 'default_anki_model' (from config/prompt) for '{command}': {default_anki_model}")
+    return default_anki_model
+
+
+def text_to_anki(args: argparse.Namespace, config: Optional[Dict[str, Any]] = None) -> None:
     """
     Convert a text file into an Anki-compatible format, creating an Anki deck.
+    `config` lets a caller that already loaded the config (process) pass it on.
     """
-    config = load_config()
-    anki_model_to_use = args.anki_model
-    if not anki_model_to_use:
-        # Pass interactive=True as this is called from main thread context for text2anki
-        default_anki_model = get_default_anki_model(config, interactive=True)
-        if default_anki_model:
-            anki_model_to_use = default_anki_model
-            print(f"[INFO] Using default Anki model (from config/prompt): {default_anki_model}")
-        else:
-            print("[ERROR] No Anki model specified and no default configured/provided for 'text2anki'.")
-            print("  Use the anki_model argument or set 'default_anki_model' via 'pdf2anki config set default_anki_model <name>'.")
-            sys.exit(1)
+    from . import text2anki
+    if config is None:
+        config = load_config()
+    anki_model_to_use = _resolve_anki_model(args, config, "text2anki")
     text2anki.convert_text_to_anki(args.text_file, args.anki_file, anki_model_to_use)
 
 
@@ -725,6 +1044,7 @@ def json_to_anki(args: argparse.Namespace) -> None:
     """
     Convert a JSON file (or all JSON files in a directory) of flashcards to an Anki package (no LLM).
     """
+    from . import text2anki
     if getattr(args, 'show_format', False):
         show_json_format()
         return
@@ -801,63 +1121,56 @@ def process_pdf_to_anki(args: argparse.Namespace) -> None:
 
     # --- Resolve OCR Model for Step 2 ---
     _apply_ocr_presets_and_resolve_model(args, config)
-    ocr_models_for_step2 = list(args.model)
     # --- End OCR Model Resolution ---
 
     # --- Resolve Anki Model for Step 3 ---
-    anki_model_to_use = args.anki_model # From 'process' command's anki_model arg
-    if not anki_model_to_use:
-        # interactive=True as this is main thread for 'process'
-        default_anki_model = get_default_anki_model(config, interactive=True)
-        if default_anki_model:
-            anki_model_to_use = default_anki_model
-            print(f"[INFO] Using 'default_anki_model' (from config/prompt) for 'process': {anki_model_to_use}")
-        else:
-            print("[ERROR] No Anki model specified for 'process' command and no 'default_anki_model' configured/provided.")
-            sys.exit(1)
-    # --- End Anki Model Resolution ---
-
-    anki_path = Path(args.anki_file)
-    pid_suffix = f"_{os.getpid()}" if hasattr(os, 'getpid') else ""
-    output_text_file_path = anki_path.with_name(f"{anki_path.stem}_temp_ocr{pid_suffix}.txt")
+    anki_model_to_use = _resolve_anki_model(args, config, "process")
 
     # Step 1: PDF to Images
     pdf_to_images_args = argparse.Namespace(
         pdf_path=args.pdf_path, output_dir=args.output_dir, rectangles=[],
         resume_existing=not getattr(args, 'no_resume', False),
+        image_format=getattr(args, 'image_format', 'png'),
+        render_workers=getattr(args, 'render_workers', 1),
         verbose=getattr(args, 'verbose', False)
     )
     print(f"[INFO] Step 1 (process): Converting PDF '{args.pdf_path}' to images in '{args.output_dir}'...")
     pdf_to_images(pdf_to_images_args)
 
-    # Step 2: Images to Text — use single-dir path directly (we know shape).
-    images_to_text_args_for_process = argparse.Namespace(
-        images_dir=args.output_dir, output_file=str(output_text_file_path),
-        model=ocr_models_for_step2,
-        repeat=args.repeat, judge_model=args.judge_model, judge_mode=args.judge_mode,
-        ensemble_strategy=args.ensemble_strategy, trust_score=args.trust_score,
-        judge_with_image=args.judge_with_image,
-        no_resume=getattr(args, 'no_resume', False),
-        max_page_attempts=getattr(args, 'max_page_attempts', 40),
-        max_concurrent_pages=getattr(args, 'max_concurrent_pages', None),
-        max_image_kb=getattr(args, 'max_image_kb', pic2text.DEFAULT_MAX_IMAGE_KB),
-        verbose=getattr(args, 'verbose', False)
-    )
-    print(f"[INFO] Step 2 (process): Extracting text to '{output_text_file_path}'...")
-    _run_single_dir_ocr(images_to_text_args_for_process)
-
-    # Step 3: Text to Anki
-    text_to_anki_args_for_process = argparse.Namespace(
-        text_file=str(output_text_file_path), anki_file=args.anki_file,
-        anki_model=anki_model_to_use, # Use resolved Anki model
-        verbose=getattr(args, 'verbose', False)
-    )
-    print(f"[INFO] Step 3 (process): Converting text to Anki deck '{args.anki_file}'...")
-    text_to_anki(text_to_anki_args_for_process)
+    # The OCR text only feeds Step 3, so keep it (and its OCR state/log files)
+    # in a private temp dir instead of next to the .apkg. Concurrent runs can't
+    # collide, and the temp dir is usually on local disk or tmpfs.
+    with tempfile.TemporaryDirectory(prefix="pdf2anki_", ignore_cleanup_errors=True) as tmp_dir:
+        output_text_file_path = Path(tmp_dir) / f"{Path(args.anki_file).stem}_ocr.txt"
+
+        # Step 2: Images to Text — call the OCR step directly (we know the shape).
+        print(f"[INFO] Step 2 (process): Extracting text to temporary file '{output_text_file_path}'...")
+        run_pic2text(
+            images_dir=args.output_dir,
+            output_file=str(output_text_file_path),
+            text_layer_pages=_text_layer_pages_for(args.pdf_path, args),
+            **OCRSettings.from_args(args).as_kwargs(),
+        )
+        if getattr(args, 'keep_intermediate', False):
+            import shutil
+            kept_text_file = Path(args.anki_file).with_name(output_text_file_path.name)
+            shutil.copyfile(output_text_file_path, kept_text_file)
+            print(f"[INFO] Kept intermediate OCR text at '{kept_text_file}' (--keep-intermediate).")
+            # The OCR/judge logs were written next to the temp text file too.
+            for log_file in sorted(Path(tmp_dir).glob("*.log")):
+                shutil.copyfile(log_file, kept_text_file.with_name(log_file.name))
+                print(f"[INFO] Kept log '{kept_text_file.with_name(log_file.name)}' (--keep-intermediate).")
+
+        # Step 3: Text to Anki
+        text_to_anki_args_for_process = argparse.Namespace(
+            text_file=str(output_text_file_path), anki_file=args.anki_file,
+            anki_model=anki_model_to_use, # Use resolved Anki model
+            verbose=getattr(args, 'verbose', False)
+        )
+        print(f"[INFO] Step 3 (process): Converting text to Anki deck '{args.anki_file}'...")
+        text_to_anki(text_to_anki_args_for_process, config)
 
-    # Optional: Cleanup temp text file
-    # try: Path(output_text_file_path).unlink() except OSError: pass
-    print(f"[INFO] 'process' command completed for '{args.pdf_path}'. Temp text file: {output_text_file_path}")
+    print(f"[INFO] 'process' command completed for '{args.pdf_path}'.")
 
 
 def view_config(args: argparse.Namespace) -> None:
@@ -870,7 +1183,7 @@ def view_config(args: argparse.Namespace) -> None:
         print("  pdf2anki config set defaults model <model_name>     # OCR preset (overrides default_model)")
         return
 
-    print(json.dumps(config, indent=2))
+    print(_json_dumps(config).decode("utf-8"))
 
     if getattr(args, 'raw', False):
         return
@@ -1033,6 +1346,41 @@ def unset_config_value(args: argparse.Namespace) -> None:
     print("Tip: run 'pdf2anki config view' to see the new effective settings.")
 
 
+_TRUTHY = frozenset(("true", "1", "yes", "on"))
+_FALSY = frozenset(("false", "0", "no", "off"))
+
+
+def cache_command(args: argparse.Namespace) -> None:
+    """Show the size of the OCR cache or empty it."""
+    from .ocr_cache import OCRCache
+    cache = OCRCache(args.cache_dir)
+    if args.cache_action == "clear":
+        removed = cache.clear()
+        print(f"[INFO] Removed {removed} entries from the OCR cache at {cache.cache_dir}.")
+        return
+    entries, total_bytes = cache.usage()
+    print(f"[INFO] OCR cache at {cache.cache_dir}: {entries} entries, {total_bytes / (1024 * 1024):.1f} MB.")
+
+
+def _parse_bool(value_str: str) -> bool:
+    lower_val = value_str.strip().lower()
+    if lower_val in _TRUTHY:
+        return True
+    if lower_val in _FALSY:
+        return False
+    raise ValueError(f"Invalid boolean: '{value_str}'. Use true/false.")
+
+
+# `config set defaults <subkey> <value>`: subkey -> parser of the raw value.
+_DEFAULTS_PARSERS: Dict[str, Callable[[str], Any]] = {
+    'model': lambda v: [m.strip() for m in v.split(',') if m.strip()],
+    'repeat': lambda v: [int(r.strip()) for r in v.split(',') if r.strip()],
+    'judge_model': lambda v: v.strip() or None,
+    'judge_mode': str.strip,
+    'judge_with_image': _parse_bool,
+}
+
+
 def set_config_value(args: argparse.Namespace) -> None:
     config = load_config()
     key = args.key
@@ -1063,7 +1411,7 @@ def set_config_value(args: argparse.Namespace) -> None:
                 # ... (validation as before) ...
                 config["defaults"] = defaults_obj
                 save_config(config)
-                print(f"Set 'defaults' using JSON object: {json.dumps(defaults_obj, indent=2)}")
+                print(f"Set 'defaults' using JSON object: {json_str}")
             except json.JSONDecodeError:
                 print(f"[ERROR] Invalid JSON for 'defaults': '{json_str}'.")
             except ValueError as e:
@@ -1074,19 +1422,12 @@ def set_config_value(args: argparse.Namespace) -> None:
             value_str = " ".join(values[1:])
             defaults = config.get("defaults", {})
             try:
-                if subkey == "model": defaults[subkey] = [m.strip() for m in value_str.split(',') if m.strip()]
-                elif subkey == "repeat": defaults[subkey] = [int(r.strip()) for r in value_str.split(',') if r.strip()]
-                elif subkey == "judge_model": defaults[subkey] = value_str.strip() if value_str.strip() else None
-                elif subkey == "judge_mode": defaults[subkey] = value_str.strip()
-                elif subkey == "judge_with_image":
-                    lower_val = value_str.strip().lower()
-                    if lower_val in ["true", "1", "yes", "on"]: defaults[subkey] = True
-                    elif lower_val in ["false", "0", "no", "off"]: defaults[subkey] = False
-                    else: raise ValueError(f"Invalid boolean: '{value_str}'. Use true/false.")
-                else:
+                parse_value = _DEFAULTS_PARSERS.get(subkey)
+                if parse_value is None:
                     print(f"[ERROR] Unknown 'defaults' subkey: '{subkey}'.")
-                    print(f"        Valid subkeys: model, repeat, judge_model, judge_mode, judge_with_image")
+                    print(f"        Valid subkeys: {', '.join(_DEFAULTS_PARSERS)}")
                     return
+                defaults[subkey] = parse_value(value_str)
                 config["defaults"] = defaults
                 save_config(config)
                 print(f"Set 'defaults.{subkey}' to: {defaults[subkey]}")
@@ -1154,96 +1495,105 @@ def set_config_value(args: argparse.Namespace) -> None:
         print(f"\nRun 'pdf2anki config set -h' for full help, or 'pdf2anki config view' for current state.")
 
 
-def cli_invoke() -> None:
-    # Early intercept for '.' — lazy mode (pdf2anki .)
-    if len(sys.argv) > 1 and sys.argv[1] == '.':
-        import argparse as _ap
-        _parser = _ap.ArgumentParser(
-            prog="pdf2anki .",
-            description="Lazy mode: auto-detect pipeline state and run all pending steps.",
-        )
-        _parser.add_argument("--turns", type=int, default=7, metavar="N",
-                             help="Max LLM discovery turns (default: 7).")
-        _parser.add_argument("--no-llm", action="store_true",
-                             help="Use guided wizard instead of LLM discovery.")
-        _parser.add_argument("--reconfig", action="store_true",
-                             help="Re-run discovery even if project.json already exists.")
-        _parser.add_argument("--ocr-model", type=str, default=None, metavar="MODEL",
-                             help="OCR model for pending PDFs (default: google/gemini-2.5-flash).")
-        _parser.add_argument("--max-concurrent-pages", type=int, default=None, metavar="N",
-                             help="Pages processed in parallel within one PDF "
-                                  "(default: per-model auto-tuner; 1 = sequential).")
-        _parser.add_argument("--max-image-kb", type=int, default=None, metavar="KB",
-                             help=f"Image payload normalization target KB "
-                                  f"(default: {pic2text.DEFAULT_MAX_IMAGE_KB}; 0 = disable).")
-        _parser.add_argument("-y", "--yes", action="store_true",
-                             help="Skip interactive confirmation prompts (auto-accept).")
-        _parser.add_argument("-v", "--verbose", action="store_true",
-                             help="Enable verbose output (L1 summaries on console).")
-        _args = _parser.parse_args(sys.argv[2:])
-        if _args.verbose:
-            from .text2anki.console_utils import set_verbose
-            set_verbose(True)
-        from .text2anki.lazy_runner import run_lazy_mode
-        run_lazy_mode(
-            base_dir=Path.cwd(),
-            turns=_args.turns,
-            no_llm=_args.no_llm,
-            reconfig=_args.reconfig,
-            ocr_model=_args.ocr_model,
-            max_concurrent_pages=_args.max_concurrent_pages,
-            max_image_kb=_args.max_image_kb,
-            auto_confirm=_args.yes,
-        )
-        return
+# (flag, add_argument kwargs) for the OCR flag group, registered in order.
+_OCR_FLAGS: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ("--model", dict(action="append", default=[], help="OCR model(s) to use (overrides presets).")),
+    ("--repeat", dict(action="append", type=int, default=[], help="Repeats per model (overrides presets).")),
+    ("--judge-model", dict(type=str, default=None, help="Judge model to use (overrides presets).")),
+    ("--judge-mode", dict(type=str, default=_JUDGE_MODE_CHOICES[0], choices=_JUDGE_MODE_CHOICES, help="Judge mode.")),
+    ("--ensemble-strategy", dict(type=str, default=None, help="(Placeholder).")),
+    ("--trust-score", dict(type=float, default=None, help="(Placeholder).")),
+    ("--judge-with-image", dict(action="store_true", default=False, help="Judge sees image (overrides presets).")),
+    ("--no-resume", dict(action="store_true", default=False, help="Disable OCR resume and start this OCR run from scratch (OCR cache entries are not reused, fresh results still refresh the cache).")),
+    ("--max-page-attempts", dict(type=int, default=40, help="Maximum full OCR attempts per page before pausing the run.")),
+    ("--max-concurrent-pages", dict(type=int, default=None, help="Pages processed in parallel within one PDF (default: per-model auto-tuner; 1 = sequential).")),
+    ("--max-image-kb", dict(type=int, default=None, help=f"Cap the JPEG payload sent to the OCR API (KB). 0 = disable. Default: {_DEFAULT_MAX_IMAGE_KB_HELP}.")),
+    ("--no-cache", dict(action="store_true", help="Do not read or write the on-disk OCR cache (~/.pdf2anki/ocr_cache).")),
+    ("--cache-dir", dict(type=str, default=None, help="Directory for the OCR cache (default: ~/.pdf2anki/ocr_cache).")),
+)
+_OCR_THRESHOLD_FLAG: Tuple[str, Dict[str, Any]] = (
+    "--ocr-threshold",
+    dict(type=int, default=0, metavar="N", help="Take pages whose PDF text layer has at least N non-whitespace characters as-is and skip OCR for them (full-page mode only). 0 = always OCR (default). Note: text-layer pages get no [Visual Description] blocks."),
+)
+
+
+def _add_ocr_flags(parser: argparse.ArgumentParser, text_layer: bool = False) -> None:
+    """OCR flag group shared by pic2text, pdf2text and process.
+
+    Defaults in _OCR_FLAGS must stay in sync with _PARSER_OCR_DEFAULTS
+    (presets only fill values the user left at these defaults).
+    """
+    for flag, kwargs in _OCR_FLAGS + ((_OCR_THRESHOLD_FLAG,) if text_layer else ()):
+        parser.add_argument(flag, **kwargs)
 
-    # Early intercept for 'workflow' subcommand — delegate directly to workflow_manager
-    # before argparse tries to parse workflow-specific flags (--project, --extract, etc.)
-    if len(sys.argv) > 1 and sys.argv[1] == 'workflow':
-        from .text2anki import workflow_manager as wm_module
-        sys.argv = [sys.argv[0]] + sys.argv[2:]
-        wm_module.main()
-        return
 
-    parser = argparse.ArgumentParser(
-        description="Convert PDFs to Anki flashcards."
-    )
-    parser.add_argument(
-        "-v", "--verbose", action="store_true",
-        help="Enable verbose output."
-    )
-    subparsers = parser.add_subparsers(title="Commands", dest="command", required=True)
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _add_jobs_flag(parser: argparse.ArgumentParser, unit: str, worker: str) -> None:
+    parser.add_argument("-j", "--jobs", type=_positive_int, default=None, metavar="N", help=f"Directory mode: number of {unit} processed in parallel, {worker} (default: env PDF2ANKI_WORKERS, else 0.6 x CPU cores).")
+
+
+def _add_image_format_flag(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--image-format", choices=_IMAGE_FORMAT_CHOICES, default="png", help="File format for full-page images (default: png). webp files are several times smaller, jpeg is the fastest to write; crops are always JPEG.")
+
+
+def _add_render_workers_flag(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--render-workers", type=_positive_int, default=1, metavar="N", help="Render the pages of each PDF in N worker processes (default: 1, sequential). Multiplies with --jobs in directory mode.")
 
-    # --- PDF to Images Command ---
-    parser_pdf2pic = subparsers.add_parser("pdf2pic", help="Convert PDF pages to images.")
+
+def _add_recrop_pdf_flag(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--recrop-pdf", action="store_true", default=False, help="With crop rectangles: also write <name>_recrop.pdf with all crops for review (OCR uses the crop images).")
+
+
+# One-line summaries shown in the `pdf2anki -h` command listing.
+_COMMAND_HELP: Dict[str, str] = {
+    "pdf2pic": "Convert PDF pages to images.",
+    "pic2text": "Extract text from images using OCR.",
+    "pdf2text": "PDF or directory of PDFs to text (parallel for dirs).",
+    "text2anki": "Convert text to Anki package.",
+    "json2anki": "Convert a pre-formatted JSON flashcard file (or all JSON files in a directory) to an Anki package (offline, no LLM).",
+    "process": "Run entire pipeline sequentially for one PDF.",
+    "workflow": "Project-based Anki card workflow: ingest, integrate, sync, export.",
+    "config": "View or modify configuration (default models, presets, etc.).",
+    "cache": "Show the size of the OCR cache or clear it.",
+}
+
+
+def _add_pdf2pic_command(subparsers: Any) -> None:
+    parser_pdf2pic = subparsers.add_parser("pdf2pic", help=_COMMAND_HELP["pdf2pic"])
     parser_pdf2pic.add_argument("pdf_path", type=str, help="Path to PDF.")
     parser_pdf2pic.add_argument("output_dir", type=str, help="Directory for images.")
-    parser_pdf2pic.add_argument("rectangles", type=str, nargs="*", default=[], help="Crop rectangles 'l,t,r,b'.")
+    parser_pdf2pic.add_argument("rectangles", type=_parse_rect, nargs="*", default=[], help="Crop rectangles 'l,t,r,b'.")
     parser_pdf2pic.add_argument("--resume-existing", action="store_true", default=False, help="Reuse existing valid page images/crops and only generate missing or invalid ones.")
-    parser_pdf2pic.set_defaults(func=pdf_to_images)
+    _add_image_format_flag(parser_pdf2pic)
+    _add_render_workers_flag(parser_pdf2pic)
+    _add_recrop_pdf_flag(parser_pdf2pic)
+    parser_pdf2pic.set_defaults(func_name="pdf_to_images")
+
 
-    # --- Images to Text Command ---
-    parser_pic2text = subparsers.add_parser("pic2text", help="Extract text from images using OCR.")
+def _add_pic2text_command(subparsers: Any) -> None:
+    parser_pic2text = subparsers.add_parser("pic2text", help=_COMMAND_HELP["pic2text"])
     parser_pic2text.add_argument("images_dir", type=str, help="Directory with images.")
     parser_pic2text.add_argument("output_file", type=str, nargs='?', default=None, help="Optional: File to save text. Defaults to a file named after the input directory.")
-    parser_pic2text.add_argument("--model", action="append", default=[], help="OCR model(s) to use (overrides presets).")
-    parser_pic2text.add_argument("--repeat", action="append", type=int, default=[], help="Repeats per model (overrides presets).")
-    parser_pic2text.add_argument("--judge-model", type=str, default=None, help="Judge model to use (overrides presets).")
-    parser_pic2text.add_argument("--judge-mode", type=str, default="authoritative", choices=["authoritative"], help="Judge mode.")
-    parser_pic2text.add_argument("--ensemble-strategy", type=str, default=None, help="(Placeholder).")
-    parser_pic2text.add_argument("--trust-score", type=float, default=None, help="(Placeholder).")
-    parser_pic2text.add_argument("--judge-with-image", action="store_true", default=False, help="Judge sees image (overrides presets).")
-    parser_pic2text.add_argument("--no-resume", action="store_true", default=False, help="Disable OCR resume and start this OCR run from scratch.")
-    parser_pic2text.add_argument("--max-page-attempts", type=int, default=40, help="Maximum full OCR attempts per page before pausing the run.")
-    parser_pic2text.add_argument("--max-concurrent-pages", type=int, default=None, help="Pages processed in parallel within one PDF (default: per-model auto-tuner; 1 = sequential).")
-    parser_pic2text.add_argument("--max-image-kb", type=int, default=pic2text.DEFAULT_MAX_IMAGE_KB, help=f"Cap the JPEG payload sent to the OCR API (KB). 0 = disable. Default: {pic2text.DEFAULT_MAX_IMAGE_KB}.")
-    parser_pic2text.set_defaults(func=images_to_text)
-
-    # --- PDF to Text Command ---
-    parser_pdf2text = subparsers.add_parser("pdf2text", help="PDF or directory of PDFs to text (parallel for dirs).")
+    _add_ocr_flags(parser_pic2text)
+    _add_jobs_flag(parser_pic2text, "image subdirectories", "one worker thread each unless --executor process")
+    parser_pic2text.add_argument("--executor", choices=("auto", "thread", "process"), default="auto", help="Directory mode: run subdirectories on worker threads or processes. auto (default) = threads, since the work is network-bound OCR.")
+    parser_pic2text.set_defaults(func_name="images_to_text")
+
+
+def _add_pdf2text_command(subparsers: Any) -> None:
+    parser_pdf2text = subparsers.add_parser("pdf2text", help=_COMMAND_HELP["pdf2text"])
     parser_pdf2text.add_argument("pdf_path", type=str, help="PDF file or directory of PDFs.")
     parser_pdf2text.add_argument("output_dir", type=str, nargs='?', default=None, help="Optional: Image dir base / specific dir.")
-    parser_pdf2text.add_argument("rectangles", type=str, nargs="*", default=[], help="Optional: Crop rectangles.")
+    parser_pdf2text.add_argument("rectangles", type=_parse_rect, nargs="*", default=[], help="Optional: Crop rectangles.")
     parser_pdf2text.add_argument("output_file", type=str, nargs='?', default=None, help="Optional: Text output dir / file.")
     parser_pdf2text.add_argument(
         "-r", "--recursive", action="store_true", default=False,
@@ -1252,64 +1602,55 @@ def cli_invoke() -> None:
             "images are written next to that PDF (<dir>/<stem>.txt and <dir>/pdf2pic/<stem>/), "
             "so the folder structure is preserved and previously processed folders resume. "
             "Skips pdf2pic/ and log_archive/. Cannot be combined with an explicit output dir/file. "
-            "Note: more PDFs means more worker processes -- throttle with --max-concurrent-pages "
-            "if you want a gentler request rate."
+            "Note: more PDFs means more worker processes -- throttle with --jobs and "
+            "--max-concurrent-pages if you want a gentler request rate."
         ),
     )
-    parser_pdf2text.add_argument("--model", action="append", default=[], help="OCR model(s) to use (overrides presets).")
-    parser_pdf2text.add_argument("--repeat", action="append", type=int, default=[], help="Repeats per model (overrides presets).")
-    parser_pdf2text.add_argument("--judge-model", type=str, default=None, help="Judge model to use (overrides presets).")
-    parser_pdf2text.add_argument("--judge-mode", type=str, default="authoritative", choices=["authoritative"], help="Judge mode.")
-    parser_pdf2text.add_argument("--ensemble-strategy", type=str, default=None, help="(Placeholder).")
-    parser_pdf2text.add_argument("--trust-score", type=float, default=None, help="(Placeholder).")
-    parser_pdf2text.add_argument("--judge-with-image", action="store_true", default=False, help="Judge sees image (overrides presets).")
-    parser_pdf2text.add_argument("--no-resume", action="store_true", default=False, help="Disable OCR resume and start this OCR run from scratch.")
-    parser_pdf2text.add_argument("--max-page-attempts", type=int, default=40, help="Maximum full OCR attempts per page before pausing the run.")
-    parser_pdf2text.add_argument("--max-concurrent-pages", type=int, default=None, help="Pages processed in parallel within one PDF (default: per-model auto-tuner; 1 = sequential).")
-    parser_pdf2text.add_argument("--max-image-kb", type=int, default=pic2text.DEFAULT_MAX_IMAGE_KB, help=f"Cap the JPEG payload sent to the OCR API (KB). 0 = disable. Default: {pic2text.DEFAULT_MAX_IMAGE_KB}.")
-    parser_pdf2text.set_defaults(func=pdf_to_text)
-    
-    # --- Text to Anki Command ---
-    parser_text2anki = subparsers.add_parser("text2anki", help="Convert text to Anki package.")
+    _add_ocr_flags(parser_pdf2text, text_layer=True)
+    _add_jobs_flag(parser_pdf2text, "PDFs", "one worker process each")
+    _add_image_format_flag(parser_pdf2text)
+    _add_render_workers_flag(parser_pdf2text)
+    _add_recrop_pdf_flag(parser_pdf2text)
+    parser_pdf2text.set_defaults(func_name="pdf_to_text")
+
+
+def _add_text2anki_command(subparsers: Any) -> None:
+    parser_text2anki = subparsers.add_parser("text2anki", help=_COMMAND_HELP["text2anki"])
     parser_text2anki.add_argument("text_file", type=str, help="Input text file.")
     parser_text2anki.add_argument("anki_file", type=str, help="Output Anki .apkg file.")
     parser_text2anki.add_argument("anki_model", type=str, nargs='?', default=None, help="Model for Anki generation.")
-    parser_text2anki.set_defaults(func=text_to_anki)
+    parser_text2anki.set_defaults(func_name="text_to_anki")
+
 
-    # New: JSON→Anki subcommand
+def _add_json2anki_command(subparsers: Any) -> None:
     parser_json2anki = subparsers.add_parser(
         "json2anki",
-        help="Convert a pre-formatted JSON flashcard file (or all JSON files in a directory) to an Anki package (offline, no LLM)."
+        help=_COMMAND_HELP["json2anki"]
     )
     parser_json2anki.add_argument("json_file", type=str, nargs='?', help="Input JSON flashcards file or directory containing JSON files.")
     parser_json2anki.add_argument("anki_file", type=str, nargs='?', help="Output Anki .apkg file (optional, defaults to same name as input with .apkg extension). Ignored for directory input.")
     parser_json2anki.add_argument("--show-format", action="store_true", 
                                 help="Print example card structure and exit.")
-    parser_json2anki.set_defaults(func=json_to_anki)
+    parser_json2anki.set_defaults(func_name="json_to_anki")
 
-    # --- Full Pipeline Command ('process') ---
-    parser_process = subparsers.add_parser("process", help="Run entire pipeline sequentially for one PDF.")
+
+def _add_process_command(subparsers: Any) -> None:
+    parser_process = subparsers.add_parser("process", help=_COMMAND_HELP["process"])
     parser_process.add_argument("pdf_path", type=str, help="Input PDF file.")
     parser_process.add_argument("output_dir", type=str, help="Directory for intermediate images.")
     parser_process.add_argument("anki_file", type=str, help="Output Anki .apkg file.")
     parser_process.add_argument("anki_model", type=str, nargs='?', default=None, help="Model for Anki generation.")
-    parser_process.add_argument("--model", action="append", default=[], help="OCR model for text extraction (overrides presets).")
-    parser_process.add_argument("--repeat", action="append", type=int, default=[], help="Repeats for OCR model (overrides presets).")
-    parser_process.add_argument("--judge-model", type=str, default=None, help="Judge model for OCR (overrides presets).")
-    parser_process.add_argument("--judge-mode", type=str, default="authoritative", choices=["authoritative"], help="Judge mode for OCR.")
-    parser_process.add_argument("--ensemble-strategy", type=str, default=None, help="(Placeholder).")
-    parser_process.add_argument("--trust-score", type=float, default=None, help="(Placeholder).")
-    parser_process.add_argument("--judge-with-image", action="store_true", default=False, help="Judge sees image in OCR step (overrides presets).")
-    parser_process.add_argument("--no-resume", action="store_true", default=False, help="Disable OCR resume and start this OCR run from scratch.")
-    parser_process.add_argument("--max-page-attempts", type=int, default=40, help="Maximum full OCR attempts per page before pausing the run.")
-    parser_process.add_argument("--max-concurrent-pages", type=int, default=None, help="Pages processed in parallel within one PDF (default: per-model auto-tuner; 1 = sequential).")
-    parser_process.add_argument("--max-image-kb", type=int, default=pic2text.DEFAULT_MAX_IMAGE_KB, help=f"Cap the JPEG payload sent to the OCR API (KB). 0 = disable. Default: {pic2text.DEFAULT_MAX_IMAGE_KB}.")
-    parser_process.set_defaults(func=process_pdf_to_anki)
-
-    # --- Workflow Command (project-based card generation) ---
+    _add_ocr_flags(parser_process, text_layer=True)
+    _add_image_format_flag(parser_process)
+    _add_render_workers_flag(parser_process)
+    parser_process.add_argument("--keep-intermediate", action="store_true", default=False, help="Also save the intermediate OCR text (as <anki stem>_ocr.txt) and the OCR/judge logs next to the Anki file (they are otherwise written to a temporary directory and removed).")
+    parser_process.set_defaults(func_name="process_pdf_to_anki")
+
+
+def _add_workflow_command(subparsers: Any) -> None:
     parser_workflow = subparsers.add_parser(
         "workflow",
-        help="Project-based Anki card workflow: ingest, integrate, sync, export.",
+        help=_COMMAND_HELP["workflow"],
         description=(
             "Project-based card management workflow.\n"
             "All options are passed through to the workflow manager.\n\n"
@@ -1322,12 +1663,13 @@ def cli_invoke() -> None:
         add_help=False,
     )
     parser_workflow.add_argument("workflow_args", nargs=argparse.REMAINDER)
-    parser_workflow.set_defaults(func=lambda args: _run_workflow(args.workflow_args))
+    parser_workflow.set_defaults(func_name="_workflow_command")
+
 
-    # --- Configuration Command ---
+def _add_config_command(subparsers: Any) -> None:
     parser_config = subparsers.add_parser(
         "config",
-        help="View or modify configuration (default models, presets, etc.).",
+        help=_COMMAND_HELP["config"],
         formatter_class=argparse.RawTextHelpFormatter,
         description=(
             "View or modify pdf2anki configuration.\n"
@@ -1380,7 +1722,7 @@ def cli_invoke() -> None:
         action="store_true",
         help="Print only the JSON config, without the annotated 'effective settings' block.",
     )
-    parser_config_view.set_defaults(func=view_config)
+    parser_config_view.set_defaults(func_name="view_config")
     parser_config_set = config_subparsers.add_parser(
         "set",
         help="Set a config value (global default or preset subkey).",
@@ -1455,7 +1797,7 @@ def cli_invoke() -> None:
             "  defaults '<json>':                   replace entire preset object via JSON string"
         ),
     )
-    parser_config_set.set_defaults(func=set_config_value)
+    parser_config_set.set_defaults(func_name="set_config_value")
 
     parser_config_unset = config_subparsers.add_parser(
         "unset",
@@ -1510,26 +1852,162 @@ def cli_invoke() -> None:
             "If omitted with key='defaults', removes the entire preset block."
         ),
     )
-    parser_config_unset.set_defaults(func=unset_config_value)
+    parser_config_unset.set_defaults(func_name="unset_config_value")
+
+
+def _add_cache_command(subparsers: Any) -> None:
+    parser_cache = subparsers.add_parser("cache", help=_COMMAND_HELP["cache"])
+    parser_cache.add_argument("cache_action", choices=("info", "clear"), help="info: entry count and size; clear: delete every entry.")
+    parser_cache.add_argument("--cache-dir", type=str, default=None, help="OCR cache directory (default: ~/.pdf2anki/ocr_cache).")
+    parser_cache.set_defaults(func_name="cache_command")
+
+
+# Subcommand registry, in `pdf2anki -h` listing order. Each entry adds its
+# subparser (arguments + set_defaults(func_name=...)) to the given subparsers action.
+_COMMANDS: Dict[str, Callable[[Any], None]] = {
+    "pdf2pic": _add_pdf2pic_command,
+    "pic2text": _add_pic2text_command,
+    "pdf2text": _add_pdf2text_command,
+    "text2anki": _add_text2anki_command,
+    "json2anki": _add_json2anki_command,
+    "process": _add_process_command,
+    "workflow": _add_workflow_command,
+    "config": _add_config_command,
+    "cache": _add_cache_command,
+}
+
+
+def _requested_command(argv: Sequence[str]) -> Optional[str]:
+    """The subcommand named by the first positional token, if it is a known one.
+
+    Help requested before the command (`pdf2anki -h pdf2pic`) is top-level
+    help, which must list every command.
+    """
+    for token in argv:
+        if token in ("-h", "--help"):
+            return None
+        if not token.startswith('-'):
+            return token if token in _COMMANDS else None
+    return None
+
+
+def _build_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    """Top-level CLI parser.
+
+    With `only`, just that subcommand is registered: a normal invocation
+    never needs the other commands' flags. Without it (top-level help, no
+    or unknown command) argparse never gets past the command itself, so
+    every command is registered by name and summary only.
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert PDFs to Anki flashcards."
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="Enable verbose output."
+    )
+    # Subcommands override this; it stays None only when nothing was dispatched.
+    # Handlers are stored by name and looked up at dispatch, so a cached
+    # parser always calls the module's current function.
+    parser.set_defaults(func_name=None)
+    subparsers = parser.add_subparsers(title="Commands", dest="command", required=True)
+
+    if only is None:
+        for name in _COMMANDS:
+            subparsers.add_parser(name, help=_COMMAND_HELP[name])
+    else:
+        _COMMANDS[only](subparsers)
+    return parser
+
+
+# Parsers built so far, keyed by _build_parser's `only`. Reusing them lets
+# embedding callers (loops, tests) invoke the CLI repeatedly without
+# re-registering every flag; parse_args() leaves a parser unchanged.
+_parser_cache: Dict[Optional[str], argparse.ArgumentParser] = {}
+_parser_cache_lock = threading.Lock()
+
+
+def _get_parser(only: Optional[str] = None) -> argparse.ArgumentParser:
+    with _parser_cache_lock:
+        parser = _parser_cache.get(only)
+        if parser is None:
+            parser = _parser_cache[only] = _build_parser(only)
+    return parser
+
+
+def cli_invoke(argv: Optional[Sequence[str]] = None) -> None:
+    """CLI entry point. `argv` defaults to sys.argv[1:]."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Early intercept for '.' — lazy mode (pdf2anki .)
+    if argv[:1] == ['.']:
+        import argparse as _ap
+        _parser = _ap.ArgumentParser(
+            prog="pdf2anki .",
+            description="Lazy mode: auto-detect pipeline state and run all pending steps.",
+        )
+        _parser.add_argument("--turns", type=int, default=7, metavar="N",
+                             help="Max LLM discovery turns (default: 7).")
+        _parser.add_argument("--no-llm", action="store_true",
+                             help="Use guided wizard instead of LLM discovery.")
+        _parser.add_argument("--reconfig", action="store_true",
+                             help="Re-run discovery even if project.json already exists.")
+        _parser.add_argument("--ocr-model", type=str, default=None, metavar="MODEL",
+                             help="OCR model for pending PDFs (default: google/gemini-2.5-flash).")
+        _parser.add_argument("--max-concurrent-pages", type=int, default=None, metavar="N",
+                             help="Pages processed in parallel within one PDF "
+                                  "(default: per-model auto-tuner; 1 = sequential).")
+        _parser.add_argument("--max-image-kb", type=int, default=None, metavar="KB",
+                             help=f"Image payload normalization target KB "
+                                  f"(default: {_DEFAULT_MAX_IMAGE_KB_HELP}; 0 = disable).")
+        _parser.add_argument("-y", "--yes", action="store_true",
+                             help="Skip interactive confirmation prompts (auto-accept).")
+        _parser.add_argument("-v", "--verbose", action="store_true",
+                             help="Enable verbose output (L1 summaries on console).")
+        _args = _parser.parse_args(argv[1:])
+        if _args.verbose:
+            from .text2anki.console_utils import set_verbose
+            set_verbose(True)
+        from .text2anki.lazy_runner import run_lazy_mode
+        run_lazy_mode(
+            base_dir=Path.cwd(),
+            turns=_args.turns,
+            no_llm=_args.no_llm,
+            reconfig=_args.reconfig,
+            ocr_model=_args.ocr_model,
+            max_concurrent_pages=_args.max_concurrent_pages,
+            max_image_kb=_args.max_image_kb,
+            auto_confirm=_args.yes,
+        )
+        return
+
+    # Early intercept for 'workflow' subcommand — delegate directly to workflow_manager
+    # before argparse tries to parse workflow-specific flags (--project, --extract, etc.)
+    if argv[:1] == ['workflow']:
+        _run_workflow(argv[1:])
+        return
+
+    parser = _get_parser(_requested_command(argv))
 
     try:
-        args = parser.parse_args()
-        if hasattr(args, 'func'):
+        args = parser.parse_args(argv)
+        if args.func_name is not None:
             # Check if it's the main process before potentially prompting in get_default_model
             # This is now handled more robustly within get_default_model and pdf_to_text's main thread logic.
-            args.func(args)
+            globals()[args.func_name](args)
         else:
             parser.print_help()
     except (FileNotFoundError, ValueError) as e:
         print(f"[ERROR] {e}", file=sys.stderr)
         sys.exit(1) # Exit with error code 1 for known errors
-    except pic2text.OCRPauseException as e:
-        print(f"[PAUSED] {e}", file=sys.stderr)
-        sys.exit(3)
     except KeyboardInterrupt:
         print("\n[INFO] Operation cancelled by user (KeyboardInterrupt).", file=sys.stderr)
         sys.exit(130) # Standard exit code for Ctrl+C
     except Exception as e:
+        # pic2text is imported lazily; if it never loaded, nothing could have paused.
+        pic2text = sys.modules.get(f"{__package__}.pic2text")
+        if pic2text is not None and isinstance(e, pic2text.OCRPauseException):
+            print(f"[PAUSED] {e}", file=sys.stderr)
+            sys.exit(3)
         print(f"[UNEXPECTED ERROR] An unexpected error occurred: {e}", file=sys.stderr)
         traceback.print_exc()
         sys.exit(2) # Exit with a different error code for unexpected errors
@@ -0,0 +1,154 @@
+"""
+ocr_cache.py — Content-addressed on-disk cache for OCR responses.
+
+Re-running pic2text / pdf2text / process on the same page images (typical
+while iterating on --judge-model, --judge-with-image or --repeat) used to
+re-send every page to OpenRouter, paying seconds and money per call for a
+transcription that was already known.
+
+Each successful OCR response is stored under a key derived from exactly
+what determines it: the base64 payload that is actually uploaded (so a
+changed --max-image-kb is a different key), the model id, the repeat slot
+(attempt number within the ensemble, so `--repeat 3` still yields three
+independent samples), and a fingerprint of the OCR prompt (so editing the
+prompt invalidates old entries). Error/info texts are never stored — a
+failed call must be retried, not replayed.
+
+Judge verdicts share the store: they are keyed on the judge model, the
+complete judge prompt (which embeds every candidate text with its model and
+attempt) and the image payload when the judge sees it. With OCR results
+served from the cache, a re-run reproduces the same candidates and so skips
+the judge call as well.
+
+Layout: one UTF-8 text file per entry, sharded by the first two hex
+digits of the key, under ~/.pdf2anki/ocr_cache/ (override with
+--cache-dir). Writes go through a temp file + os.replace, so concurrent
+pages and worker processes never observe a half-written entry.
+
+Cache failures must never break OCR — every public method swallows
+OSError and behaves like a miss.
+
+With --no-resume the cache is opened in refresh mode: lookups are skipped,
+so every page really is transcribed again, but the fresh results are still
+written and replace the old entries.
+
+Disable entirely with env var PDF2ANKI_DISABLE_OCR_CACHE=1 or --no-cache.
+The cache has no size cap; `pdf2anki cache info` shows its size and
+`pdf2anki cache clear` empties it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".pdf2anki" / "ocr_cache"
+
+# Bumped when the key derivation or entry format changes.
+_KEY_SCHEMA = b"ocr-v1"
+
+
+def is_disabled() -> bool:
+    return os.environ.get("PDF2ANKI_DISABLE_OCR_CACHE", "").strip().lower() in {
+        "1", "true", "yes", "on",
+    }
+
+
+def _digest(*parts: str) -> str:
+    h = hashlib.blake2b(_KEY_SCHEMA, digest_size=16)
+    for part in parts:
+        data = part.encode("utf-8")
+        # Length-prefix every part so ("ab", "c") and ("a", "bc") differ.
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class OCRCache:
+    """Directory-backed key -> text store. Thread- and process-safe for our use.
+
+    refresh=True marks a cache whose entries must not be served (callers
+    check it before get()); put() still stores fresh results.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, refresh: bool = False):
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else DEFAULT_CACHE_DIR
+        self.refresh = refresh
+
+    @staticmethod
+    def ocr_key(base64_image: str, model_name: str, attempt_num: int, prompt: str) -> str:
+        return _digest("ocr", _digest(prompt), model_name, str(attempt_num), base64_image)
+
+    @staticmethod
+    def judge_key(judge_model: str, prompt_text: str, base64_image: Optional[str] = None) -> str:
+        return _digest("judge", judge_model, prompt_text, base64_image or "")
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self._entry_path(key).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def _files(self, pattern: str):
+        try:
+            return [p for p in self.cache_dir.glob(pattern) if p.is_file()]
+        except OSError:
+            return []
+
+    def usage(self) -> Tuple[int, int]:
+        """Return (number of entries, total bytes). Leftover temp files of
+        interrupted writes are not entries and are not counted."""
+        count = total = 0
+        for path in self._files("*/*.txt"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+            count += 1
+        return count, total
+
+    def clear(self) -> int:
+        """Delete every entry (and leftover temp file). Returns the number of entries removed."""
+        removed = 0
+        for path in self._files("*/*"):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            if path.suffix == ".txt":
+                removed += 1
+        for shard in self.cache_dir.glob("*"):
+            try:
+                shard.rmdir()
+            except OSError:
+                pass
+        return removed
+
+
+def open_cache(
+    use_cache: bool = True, cache_dir: Optional[str] = None, refresh: bool = False
+) -> Optional[OCRCache]:
+    """Return an OCRCache, or None when caching is switched off."""
+    if not use_cache or is_disabled():
+        return None
+    return OCRCache(cache_dir, refresh=refresh)
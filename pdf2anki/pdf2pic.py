@@ -16,81 +16,151 @@ Refer to the NOTICE.txt file for dependencies and third-party libraries used.
 import pymupdf  # PyMuPDF also known as fitz
 import fitz     # We'll use "fitz" for certain PDF-specific calls
 from PIL import Image
+import concurrent.futures
+import functools
+import io
+import math
 import os
+import re
 import sys
-import time
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
+
+# "left,top,right,bottom" with optional whitespace around each coordinate.
+_RECT_RE = re.compile(r"\s*(-?\d+)\s*,\s*(-?\d+)\s*,\s*(-?\d+)\s*,\s*(-?\d+)\s*")
+
+# zlib level for page PNGs. _fit_page_to_budget may encode a page several
+# times while searching for the size budget; on a 300 dpi text page level 1
+# encodes ~25% faster than Pillow's default 6 for ~10% larger files, i.e. a
+# few percent lower DPI under the same 800KB budget.
+PNG_COMPRESS_LEVEL = 1
+
+# Crops are JPEG. q90 is visually lossless for text and much faster and
+# smaller than q100; pic2text re-encodes to JPEG for the OCR call anyway.
+CROP_JPEG_QUALITY = 90
+
+# Full-page image formats: name -> (Pillow format, extension, save options).
+# WebP and JPEG are lossy q90 -- pic2text re-encodes every page to JPEG for the
+# OCR call anyway, and at the same size target both keep a higher DPI than PNG.
+# JPEG is the fastest to encode; WebP is the smallest.
+PAGE_IMAGE_FORMATS: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    "png": ("PNG", ".png", {"compress_level": PNG_COMPRESS_LEVEL}),
+    "webp": ("WEBP", ".webp", {"quality": 90, "method": 4}),
+    "jpeg": ("JPEG", ".jpg", {"quality": 90}),
+}
+# Every extension pic2text picks up as a page image.
+PAGE_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+
+def _page_image(pix, pil_format: str) -> Image.Image:
+    """
+    Wrap a rendered RGB pixmap as a Pillow image for saving as a page.
+
+    Grey-only pages (plain black text: at most 256 distinct colours, all with
+    r == g == b) are converted to mode "L" for PNG. That is lossless, and it
+    gives Deflate a third of the bytes: on a 300 dpi text page the encode is
+    roughly 2.5x faster and the file 40% smaller. Colour pages return from
+    getcolors() after the 257th colour, so the check is cheap for them.
+    """
+    # samples_mv is a view of the pixmap memory; .samples would first copy
+    # the whole buffer into a bytes object.
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+    if pil_format == "PNG":
+        colors = img.getcolors(256)
+        if colors is not None and all(r == g == b for _, (r, g, b) in colors):
+            img = img.convert("L")
+    return img
+
+
+# Full pages are sized to land in this band (KB) at the highest DPI that fits.
+PAGE_SIZE_KB_RANGE = (750, 800)
+_MIN_PAGE_DPI = 50
+_MAX_DPI_PROBES = 8
+
+
+def _encode_page(page, dpi: int, pil_format: str, save_options: Dict[str, Any]) -> bytes:
+    """Render `page` at `dpi` and return the encoded page image."""
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    img = _page_image(pix, pil_format)
+    buffer = io.BytesIO()
+    img.save(buffer, format=pil_format, dpi=(dpi, dpi), **save_options)
+    return buffer.getvalue()
+
+
+def _fit_page_to_budget(
+    page,
+    initial_dpi: int,
+    pil_format: str = "PNG",
+    verbose: bool = False,
+    save_options: Optional[Dict[str, Any]] = None
+) -> Tuple[int, bytes]:
+    """
+    Find the highest DPI <= 'initial_dpi' whose encoded page is below
+    PAGE_SIZE_KB_RANGE's upper bound, ideally inside the range.
+
+    Returns (dpi, encoded image), so the caller can write the winning probe
+    instead of rendering and encoding the page once more. Probes are encoded
+    in memory. The first probe is 'initial_dpi' (many pages already fit);
+    later ones estimate the DPI from the last size, assuming size ~ dpi**k.
+    k starts at 1.5 (between edge-dominated text, ~1, and pixel-dominated
+    images, ~2) and is refitted from the last two probes. Estimates are kept
+    inside the bracket of DPIs known to be too small/too large. If not even
+    the smallest probe fits, the page is kept at 'initial_dpi', as before.
+    """
+    min_kb, max_kb = PAGE_SIZE_KB_RANGE
+    target_kb = (min_kb + max_kb) / 2
+    save_options = save_options or {}
+    lower, upper = min(_MIN_PAGE_DPI, initial_dpi), initial_dpi
+    dpi = initial_dpi
+    best: Optional[Tuple[int, bytes]] = None
+    fallback: Optional[bytes] = None
+    exponent = 1.5
+    previous: Optional[Tuple[int, float]] = None
+
+    for _ in range(_MAX_DPI_PROBES):
+        data = _encode_page(page, dpi, pil_format, save_options)
+        size_kb = len(data) / 1024
+        if verbose:
+            print(f"[DEBUG] Tried {dpi} dpi => {size_kb:.1f} KB")
+        if dpi == initial_dpi:
+            fallback = data
+
+        if size_kb < max_kb:
+            best = (dpi, data)
+            if size_kb >= min_kb or dpi >= upper:
+                break
+            lower = dpi + 1
+        else:
+            upper = dpi - 1
+        if lower > upper:
+            break
+
+        if previous is not None and previous[0] != dpi and previous[1] > 0 and size_kb > 0:
+            fitted = math.log(size_kb / previous[1]) / math.log(dpi / previous[0])
+            exponent = max(1.0, min(2.0, fitted))
+        previous = (dpi, size_kb)
+        estimate = int(dpi * (target_kb / max(size_kb, 1.0)) ** (1 / exponent))
+        dpi = max(lower, min(upper, estimate))
+
+    if best is not None:
+        if verbose and min_kb <= len(best[1]) / 1024:
+            print(f"[DEBUG] Found acceptable size {len(best[1]) / 1024:.1f} KB at {best[0]} dpi")
+        return best
+    return initial_dpi, fallback if fallback is not None else _encode_page(page, initial_dpi, pil_format, save_options)
+
 
 def find_acceptable_dpi(
     page,
     output_path: str,
     initial_dpi: int,
     format_str: str = "PNG",
-    verbose: bool = False # Add verbose parameter
+    verbose: bool = False, # Add verbose parameter
+    save_options: Optional[Dict[str, Any]] = None
 ) -> int:
     """
-    Iteratively find a DPI that results in an image size between ~750KB and 800KB,
-    starting with 'initial_dpi'. Uses a divide-and-conquer approach.
+    Find a DPI that results in an image size between ~750KB and 800KB,
+    starting with 'initial_dpi'. See _fit_page_to_budget; probes are encoded
+    in memory, so 'output_path' is no longer written to.
     """
-    # No need for local imports if they are global
-
-    lower_dpi = 50
-    upper_dpi = initial_dpi
-    acceptable_dpi = initial_dpi
-
-    while lower_dpi <= upper_dpi:
-        mid_dpi = (lower_dpi + upper_dpi) // 2
-        if mid_dpi <= 0: # Avoid zero or negative DPI
-             break
-        zoom = mid_dpi / 72.0
-        mat = fitz.Matrix(zoom, zoom)
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-
-        # Save temporarily to check size
-        temp_path = output_path + ".temp"
-        try:
-            img.save(temp_path, format=format_str, dpi=(mid_dpi, mid_dpi))
-            size_kb = os.path.getsize(temp_path) / 1024
-
-            if verbose: # Check verbose flag before printing debug info
-                print(f"[DEBUG] Tried {mid_dpi} dpi => {size_kb:.1f} KB")
-
-            if 750 <= size_kb < 800:
-                if verbose: # Check verbose flag
-                    print(f"[DEBUG] Found acceptable size {size_kb:.1f} KB at {mid_dpi} dpi")
-                acceptable_dpi = mid_dpi
-                break
-            elif size_kb >= 800:
-                # reduce dpi
-                upper_dpi = mid_dpi - 1
-            else:
-                # size < 750
-                acceptable_dpi = mid_dpi  # might still be best so far
-                lower_dpi = mid_dpi + 1
-        finally:
-             # Clean up temporary file
-            if os.path.exists(temp_path):
-                removed = False
-                for attempt in range(5):
-                    try:
-                        os.remove(temp_path)
-                        removed = True
-                        break
-                    except PermissionError:
-                        time.sleep(0.05 * (attempt + 1))
-                if not removed:
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass
-
-    # Ensure acceptable_dpi is within reasonable bounds
-    acceptable_dpi = max(lower_dpi if lower_dpi > 50 else 50, acceptable_dpi)
-    acceptable_dpi = min(initial_dpi, acceptable_dpi)
-    acceptable_dpi = max(1, acceptable_dpi) # Ensure DPI is at least 1
-
-    return acceptable_dpi
+    return _fit_page_to_budget(page, initial_dpi, format_str, verbose=verbose, save_options=save_options)[0]
 
 
 def _is_usable_image_file(image_path: str) -> bool:
@@ -107,26 +177,186 @@ def _is_usable_image_file(image_path: str) -> bool:
         return False
 
 
+# Per-process PyMuPDF document for _render_page_in_worker: (path, document).
+_worker_pdf: Optional[Tuple[str, Any]] = None
+
+
+def _render_page_in_worker(
+    render_page: Callable[..., Tuple[List[str], List[str], str]],
+    pdf_path: str,
+    page_num: int,
+    **page_opts: Any,
+) -> Tuple[List[str], List[str], str]:
+    """Process-pool entry point: render one page, keeping the PDF open per worker."""
+    global _worker_pdf
+    if _worker_pdf is None or _worker_pdf[0] != pdf_path:
+        if _worker_pdf is not None:
+            _worker_pdf[1].close()
+        _worker_pdf = (pdf_path, pymupdf.open(pdf_path))
+    return render_page(_worker_pdf[1][page_num - 1], page_num, **page_opts)
+
+
+def _render_full_page(
+    page,
+    page_num: int,
+    total_pages: int,
+    *,
+    output_dir: str,
+    target_dpi: int,
+    verbose: bool,
+    resume_existing: bool,
+    image_format: str,
+) -> Tuple[List[str], List[str], str]:
+    """
+    Render (or, on resume, reuse) one page's full-page image.
+
+    Returns (image paths, crop paths, outcome) with outcome one of
+    "reused", "generated" or "repaired"; crop paths are always empty.
+    """
+    pil_format, page_ext, save_options = PAGE_IMAGE_FORMATS[image_format]
+    img_path = os.path.join(output_dir, f"page_{page_num}{page_ext}")
+
+    # Fast path: reuse an existing valid page image. A valid page image in
+    # another format counts as done, so switching --image-format never
+    # leaves two images of one page for OCR.
+    if resume_existing:
+        resume_exts = [page_ext] + [ext for _, ext, _ in PAGE_IMAGE_FORMATS.values() if ext != page_ext]
+        existing_path = next(
+            (path for path in (os.path.join(output_dir, f"page_{page_num}{ext}") for ext in resume_exts)
+             if _is_usable_image_file(path)),
+            None,
+        )
+        if existing_path:
+            print(f"Reused page {page_num}/{total_pages}: {existing_path}")
+            return [existing_path], [], "reused"
+
+    had_existing = resume_existing and os.path.exists(img_path)
+    if had_existing:
+        print(f"Rebuilding invalid page {page_num}/{total_pages}: {img_path}")
+
+    chosen_dpi, page_bytes = _fit_page_to_budget(
+        page, target_dpi, pil_format, verbose=verbose, save_options=save_options
+    )
+    with open(img_path, "wb") as f:
+        f.write(page_bytes)
+    # A stale image of this page in another format (e.g. --no-resume with a
+    # new --image-format) would be OCR'd alongside the new one.
+    for ext in PAGE_IMAGE_EXTS:
+        stale_path = os.path.join(output_dir, f"page_{page_num}{ext}")
+        if ext != page_ext and os.path.exists(stale_path):
+            os.remove(stale_path)
+            print(f"Removed stale page {page_num} image: {stale_path}")
+    print(f"Saved page {page_num} at final {chosen_dpi} dpi: {img_path}")
+    return [img_path], [], "repaired" if had_existing else "generated"
+
+
+@functools.lru_cache(maxsize=16)
+def _clip_rects(
+    page_rect: Tuple[float, float, float, float],
+    rectangles: Tuple[Tuple[int, int, int, int], ...],
+    target_dpi: int,
+) -> Tuple[Tuple[float, float, float, float], ...]:
+    """
+    Map rectangles given in target_dpi pixels onto the page in PDF points
+    (1/72 inch), clamped to the page. No render is needed to learn the page's
+    pixel size. Memoised on the page rect, so documents with one page size
+    compute the clips once.
+    """
+    to_points = 72.0 / target_dpi
+    x0, y0, x1, y1 = page_rect
+    return tuple(
+        (
+            max(x0, min(x0 + left * to_points, x1)),
+            max(y0, min(y0 + top * to_points, y1)),
+            max(x0, min(x0 + right * to_points, x1)),
+            max(y0, min(y0 + bottom * to_points, y1)),
+        )
+        for left, top, right, bottom in rectangles
+    )
+
+
+def _render_crops(
+    page,
+    page_num: int,
+    total_pages: int,
+    *,
+    output_dir: str,
+    target_dpi: int,
+    hi_dpi: int,
+    rectangles: List[Tuple[int, int, int, int]],
+    resume_existing: bool,
+) -> Tuple[List[str], List[str], str]:
+    """
+    Render (or, on resume, reuse) the rectangle crops of one page.
+
+    Returns (image paths, crop paths, outcome) like _render_full_page; both
+    path lists hold the crops.
+    """
+    crop_paths: List[str] = []
+
+    # Reuse if all expected crops for this page are already valid.
+    expected_crop_paths = [
+        os.path.join(output_dir, f"page_{page_num}_crop_{i}.jpg")
+        for i in range(1, len(rectangles) + 1)
+    ]
+    had_partial_existing = False
+    if resume_existing and expected_crop_paths:
+        valid_crop_paths = [crop_path for crop_path in expected_crop_paths if _is_usable_image_file(crop_path)]
+        if len(valid_crop_paths) == len(expected_crop_paths):
+            print(
+                f"Reused cropped page {page_num}/{total_pages} with "
+                f"{len(expected_crop_paths)} crop(s)."
+            )
+            return list(expected_crop_paths), list(expected_crop_paths), "reused"
+        had_partial_existing = any(os.path.exists(crop_path) for crop_path in expected_crop_paths)
+        if had_partial_existing:
+            print(
+                f"Rebuilding partial/invalid crops for page "
+                f"{page_num}/{total_pages}."
+            )
+
+    # Render only the clipped region of each rect at hi_dpi; MuPDF
+    # rasterises just the crop.
+    clips = _clip_rects(tuple(page.rect), tuple(map(tuple, rectangles)), target_dpi)
+    for i, clip_coords in enumerate(clips, start=1):
+        clip = fitz.Rect(*clip_coords)
+        pix_crop = page.get_pixmap(dpi=hi_dpi, clip=clip, alpha=False)
+        cropped = Image.frombytes("RGB", (pix_crop.width, pix_crop.height), pix_crop.samples_mv)
+        pix_crop = None
+        cropped_path = os.path.join(output_dir, f"page_{page_num}_crop_{i}.jpg")
+
+        # Save with hi_dpi
+        cropped.save(cropped_path, format="JPEG", quality=CROP_JPEG_QUALITY, dpi=(hi_dpi, hi_dpi))
+        print(f"  Cropped rectangle {i} saved at {hi_dpi} dpi: {cropped_path}")
+
+        crop_paths.append(cropped_path)
+
+    return crop_paths, list(crop_paths), "repaired" if had_partial_existing else "generated"
+
+
 def convert_pdf_to_images(
     pdf_path: str,
     output_dir: str,
     target_dpi: int = 300,
     rectangles: Optional[List[Tuple[int, int, int, int]]] = None,
     verbose: bool = False, # Add verbose parameter here
-    resume_existing: bool = False
+    resume_existing: bool = False,
+    image_format: str = "png",
+    render_workers: int = 1,
+    emit_recrop_pdf: bool = False,
 ) -> List[str]:
     """
     Convert each page of a PDF to a full-page image at 'target_dpi'.
     
-    If 'rectangles' are specified, each rectangle is given in 300-dpi coordinates.
-    For maximum cropping quality:
-      1) We first create a 300-dpi full-page image as before.
-      2) We convert the rectangle coordinates to percentages relative to
-         this 300-dpi image's width/height.
-      3) We then re-render that same PDF page at high resolution (capped at 2400 dpi)
-         and crop at those same percentages to achieve maximum detail.
-      4) We save each cropped image at the same high dpi (up to 2400).
-      5) Finally, we assemble all cropped images into 'recrop.pdf'.
+    If 'rectangles' are specified, each rectangle is given in pixel coordinates
+    of a 'target_dpi' render (300 dpi by default). For maximum cropping quality:
+      1) We map each rectangle onto the page in PDF points (72 per inch).
+      2) We then render just those regions of the PDF page at high resolution
+         (capped at 1200 dpi) via PyMuPDF's clip, for maximum detail without
+         rasterising the whole page at that resolution.
+      3) We save each cropped image at the same high dpi (up to 1200).
+      4) With 'emit_recrop_pdf', we assemble all cropped images into
+         '<name>_recrop.pdf' for human review; OCR reads the crops directly.
 
     Args:
         pdf_path: Path to the PDF file
@@ -135,6 +365,11 @@ def convert_pdf_to_images(
         rectangles: Optional list of (left, top, right, bottom) tuples in 300-dpi coordinates
         resume_existing: If True, reuse already existing valid page images/crops and
             generate only missing or invalid ones.
+        image_format: Full-page image format, a key of PAGE_IMAGE_FORMATS
+            ("png", "webp" or "jpeg"). Crops are always JPEG.
+        render_workers: Number of worker processes rendering pages in parallel.
+            1 (default) renders sequentially in this process.
+        emit_recrop_pdf: Also write '<name>_recrop.pdf' with all crops.
     
     Returns:
         List[str]: Paths to all generated images (full-page + cropped)
@@ -159,135 +394,49 @@ def convert_pdf_to_images(
         # ^ For demonstration, we pick 'target_dpi * 10' just as an example factor.
         #   Or simply: hi_dpi = 2400  # always, if rectangles exist
 
-    reused_pages = 0
-    generated_pages = 0
-    repaired_pages = 0
-    total_pages = 0
-
+    # Pick the per-page renderer once instead of branching on every page.
+    if rectangles:
+        render_page = _render_crops
+        page_opts: Dict[str, Any] = dict(
+            output_dir=output_dir, target_dpi=target_dpi, hi_dpi=hi_dpi,
+            rectangles=rectangles, resume_existing=resume_existing,
+        )
+    else:
+        render_page = _render_full_page
+        page_opts = dict(
+            output_dir=output_dir, target_dpi=target_dpi, verbose=verbose,
+            resume_existing=resume_existing, image_format=image_format,
+        )
     with pymupdf.open(pdf_path) as pdf:
         total_pages = len(pdf)
-        for page_num, page in enumerate(pdf, start=1):
-            img_path = os.path.join(output_dir, f"page_{page_num}.png")
-
-            # Fast path for standard full-page mode: reuse an existing valid page image.
-            if not rectangles and resume_existing and _is_usable_image_file(img_path):
-                images.append(img_path)
-                reused_pages += 1
-                print(f"Reused page {page_num}/{total_pages}: {img_path}")
-                continue
-
-            if not rectangles:
-                had_existing = resume_existing and os.path.exists(img_path)
-                if had_existing:
-                    print(f"Rebuilding invalid page {page_num}/{total_pages}: {img_path}")
-
-                chosen_dpi = find_acceptable_dpi(page, img_path, target_dpi, "PNG", verbose=verbose)
-                zoom_chosen = chosen_dpi / 72.0
-                mat_chosen = fitz.Matrix(zoom_chosen, zoom_chosen)
-                pix_chosen = page.get_pixmap(matrix=mat_chosen, alpha=False)
-                img_chosen = Image.frombytes("RGB", (pix_chosen.width, pix_chosen.height), pix_chosen.samples)
-                img_chosen.save(img_path, format="PNG", dpi=(chosen_dpi, chosen_dpi))
-                print(f"Saved page {page_num} at final {chosen_dpi} dpi: {img_path}")
-                images.append(img_path)
-
-                if had_existing:
-                    repaired_pages += 1
-                else:
-                    generated_pages += 1
-                continue
-
-            # Rectangles mode: reuse if all expected crops for this page are already valid.
-            expected_crop_paths = [
-                os.path.join(output_dir, f"page_{page_num}_crop_{i}.jpg")
-                for i in range(1, len(rectangles) + 1)
+        workers = max(1, min(render_workers or 1, total_pages))
+        if workers == 1:
+            results = [
+                render_page(page, page_num, total_pages, **page_opts)
+                for page_num, page in enumerate(pdf, start=1)
             ]
-            had_partial_existing = False
-            if resume_existing and expected_crop_paths:
-                valid_crop_paths = [crop_path for crop_path in expected_crop_paths if _is_usable_image_file(crop_path)]
-                if len(valid_crop_paths) == len(expected_crop_paths):
-                    for crop_path in expected_crop_paths:
-                        images.append(crop_path)
-                        cropped_images.append(crop_path)
-                    reused_pages += 1
-                    print(
-                        f"Reused cropped page {page_num}/{total_pages} with "
-                        f"{len(expected_crop_paths)} crop(s)."
-                    )
-                    continue
-                had_partial_existing = any(os.path.exists(crop_path) for crop_path in expected_crop_paths)
-                if had_partial_existing:
-                    print(
-                        f"Rebuilding partial/invalid crops for page "
-                        f"{page_num}/{total_pages}."
-                    )
-
-            # ======================
-            # 1) Render at target_dpi for the full-page image
-            # ======================
-            zoom_300 = target_dpi / 72.0
-            mat_300 = fitz.Matrix(zoom_300, zoom_300)
-            pix_300 = page.get_pixmap(matrix=mat_300, alpha=False)
-            img_300 = Image.frombytes("RGB", (pix_300.width, pix_300.height), pix_300.samples)
-
-            # ======================
-            # 2) Convert each rect to fractional coords
-            #    relative to 300-dpi image dimension
-            # ======================
-            width_300, height_300 = img_300.size
-            fractional_rects = []
-            for (left_300, top_300, right_300, bottom_300) in rectangles:
-                frac_left = left_300 / width_300
-                frac_top = top_300 / height_300
-                frac_right = right_300 / width_300
-                frac_bottom = bottom_300 / height_300
-
-                # clamp fractions in [0.0, 1.0] just to be safe
-                frac_left = max(0.0, min(frac_left, 1.0))
-                frac_top = max(0.0, min(frac_top, 1.0))
-                frac_right = max(0.0, min(frac_right, 1.0))
-                frac_bottom = max(0.0, min(frac_bottom, 1.0))
-
-                fractional_rects.append((frac_left, frac_top, frac_right, frac_bottom))
-
-            # ======================
-            # 3) Render at hi_dpi for maximum quality
-            # ======================
-            zoom_hi = hi_dpi / 72.0
-            mat_hi = fitz.Matrix(zoom_hi, zoom_hi)
-            pix_hi = page.get_pixmap(matrix=mat_hi, alpha=False)
-            img_hi = Image.frombytes("RGB", (pix_hi.width, pix_hi.height), pix_hi.samples)
-
-            # ======================
-            # 4) Crop each fractional rect from the hi-res image
-            #    and save at hi_dpi
-            # ======================
-            hi_w, hi_h = img_hi.size
-            for i, (fl, ft, fr, fb) in enumerate(fractional_rects, start=1):
-                # scale fractional coords to hi-res pixel coords
-                left_px = int(round(fl * hi_w))
-                top_px = int(round(ft * hi_h))
-                right_px = int(round(fr * hi_w))
-                bottom_px = int(round(fb * hi_h))
-
-                cropped = img_hi.crop((left_px, top_px, right_px, bottom_px))
-                cropped_path = os.path.join(output_dir, f"page_{page_num}_crop_{i}.jpg")
-
-                # Save with hi_dpi
-                cropped.save(cropped_path, format="JPEG", quality=100, dpi=(hi_dpi, hi_dpi))
-                print(f"  Cropped rectangle {i} saved at {hi_dpi} dpi: {cropped_path}")
-
-                images.append(cropped_path)
-                cropped_images.append(cropped_path)
-
-            if had_partial_existing:
-                repaired_pages += 1
-            else:
-                generated_pages += 1
+    if workers > 1:
+        # Pages are independent: each worker process opens the PDF itself
+        # (PyMuPDF objects cannot cross processes) and writes its own files.
+        print(f"[PDF2PIC] Rendering {total_pages} pages with {workers} worker processes.")
+        render = functools.partial(_render_page_in_worker, render_page, pdf_path, total_pages=total_pages, **page_opts)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(render, range(1, total_pages + 1),
+                                    chunksize=max(1, total_pages // (4 * workers))))
+
+    outcomes = {"reused": 0, "generated": 0, "repaired": 0}
+    for page_images, page_crops, outcome in results:
+        images.extend(page_images)
+        cropped_images.extend(page_crops)
+        outcomes[outcome] += 1
+    reused_pages, generated_pages, repaired_pages = (
+        outcomes["reused"], outcomes["generated"], outcomes["repaired"]
+    )
 
     # ======================
-    # 5) Create "recrop.pdf" if we have any cropped images
+    # 5) Create "recrop.pdf" from the cropped images, if requested
     # ======================
-    if cropped_images:
+    if cropped_images and emit_recrop_pdf:
         create_recrop_pdf(cropped_images, output_dir, pdf_base_name)
         print(f"Created {pdf_base_name}_recrop.pdf from all cropped images.\n")
 
@@ -300,6 +449,24 @@ def convert_pdf_to_images(
     return images
 
 
+def extract_text_layer(pdf_path: str, min_chars: int) -> Dict[int, str]:
+    """
+    Return {page_num: text} for pages whose embedded text layer has at least
+    'min_chars' non-whitespace characters (1-based page numbers).
+
+    Born-digital pages carry their text already; callers use this to skip the
+    OCR round trip for them. Scanned pages (no or only a stray text layer)
+    are left out and go through OCR as usual.
+    """
+    texts: Dict[int, str] = {}
+    with pymupdf.open(pdf_path) as pdf:
+        for page_num, page in enumerate(pdf, start=1):
+            text = page.get_text("text").strip()
+            if len("".join(text.split())) >= min_chars:
+                texts[page_num] = text
+    return texts
+
+
 def create_recrop_pdf(
     cropped_paths: List[str],
     output_dir: str,
@@ -363,14 +530,13 @@ def parse_rectangle(rect_str: str) -> Tuple[int, int, int, int]:
     Raises:
         ValueError: If string format is invalid
     """
-    coords = rect_str.split(",")
-    if len(coords) != 4:
+    m = _RECT_RE.fullmatch(rect_str)
+    if m is None:
         raise ValueError(
             f"Invalid rectangle definition '{rect_str}'. "
             "Expected format: 'left,top,right,bottom'."
         )
-    left, top, right, bottom = map(int, coords)
-    return (left, top, right, bottom)
+    return (int(m[1]), int(m[2]), int(m[3]), int(m[4]))
 
 
 if __name__ == "__main__":
@@ -383,9 +549,8 @@ if __name__ == "__main__":
     denoting (left,top,right,bottom) in 300 dpi coordinates.
 
     - A full-page PNG is created for each page at 'target_dpi' (default=300).
-    - If rectangles are specified, those coords are converted to percentages
-      relative to a 300-dpi render, and a second pass is made at up to 2400 dpi
-      for maximum cropping fidelity. Then a 'recrop.pdf' is created from all
+    - If rectangles are specified, each region is rendered on its own at up
+      to 1200 dpi for maximum cropping fidelity. Then a 'recrop.pdf' is created from all
       cropped images, placing each on its own page in either portrait or
       landscape orientation.
     """
@@ -406,5 +571,6 @@ if __name__ == "__main__":
         pdf_path,
         output_dir,
         target_dpi=300,  # or set any default you like
-        rectangles=rectangles
+        rectangles=rectangles,
+        emit_recrop_pdf=True,
     )
@@ -26,7 +26,9 @@ Resume compatibility: callers must pass the *newly completed* page count
 Tuner failures must never break OCR — every public function is wrapped
 in try/except and falls back to the cold-start constant.
 
-Disable entirely with env var PDF2ANKI_DISABLE_TUNER=1.
+Disable entirely with env var PDF2ANKI_DISABLE_TUNER=1. To pin a level
+without passing --max-concurrent-pages to every command, set
+PDF2ANKI_OCR_CONCURRENCY=N (an explicit flag still wins).
 """
 
 from __future__ import annotations
@@ -167,14 +169,33 @@ def record_observation(
         pass
 
 
+def env_concurrency() -> Optional[int]:
+    """PDF2ANKI_OCR_CONCURRENCY as a positive int; None when unset or invalid."""
+    raw = os.environ.get("PDF2ANKI_OCR_CONCURRENCY", "").strip()
+    try:
+        value = int(raw)
+    except ValueError:
+        return None
+    return value if value >= 1 else None
+
+
+def tuner_decides(explicit: Optional[int]) -> bool:
+    """True when resolve_concurrency will use the tuner's recommendation."""
+    return explicit is None and env_concurrency() is None and not is_disabled()
+
+
 def resolve_concurrency(model_id: Optional[str], explicit: Optional[int]) -> int:
     """Single chokepoint for callers.
 
-    explicit=None -> ask the tuner (or seed if disabled / no model_id).
     explicit=int  -> honor it verbatim, never persist anything from this run.
+    explicit=None -> PDF2ANKI_OCR_CONCURRENCY if set, else ask the tuner
+                     (or seed if disabled / no model_id).
     """
     if explicit is not None:
         return max(1, int(explicit))
+    from_env = env_concurrency()
+    if from_env is not None:
+        return from_env
     if not model_id:
         return COLD_START_CONCURRENCY
     return get_recommended_concurrency(model_id)
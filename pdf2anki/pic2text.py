@@ -36,6 +36,7 @@ import sys
 import threading
 
 from . import perf_tuner as _perf_tuner
+from . import ocr_cache as _ocr_cache
 
 load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
@@ -96,7 +97,50 @@ DEFAULT_MAX_IMAGE_KB = 800
 MIN_LONGEST_EDGE_PX = 1600
 MIN_JPEG_QUALITY = 60
 
+# Instruction sent with every OCR call. Part of the OCR cache key, so editing
+# it invalidates cached transcriptions.
+OCR_PROMPT = (
+    "**Critical Task:** Perform a complete and lossless textual reconstruction of the "
+    "provided image. You are acting as a perfect digital transcriber with visual "
+    "understanding capabilities.  **Input:** A single image.  **Mandatory Output "
+    "Requirements:** 1.  **Text Transcription (Verbatim & Formatted):** * "
+    "Extract **every single character** of text exactly as it appears. Do not "
+    "summarize or paraphrase.    * Replicate formatting using Markdown: "
+    "`**Bold**`, `*Italic*`, `- Unordered List`, `1. Ordered List`, ` ``` Code Block "
+    "```, standard Markdown tables.    * Represent mathematical content "
+    "accurately: Use `<math>LaTeX expression</math>` for inline math and `<math "
+    "display=\"block\">LaTeX expression</math>` for display/block equations. Ensure "
+    "LaTeX is KaTeX compatible.    * Preserve meaningful line breaks and paragraph "
+    "structures.  2.  **Visual Element Identification & Detailed Description:** * "
+    "Identify **all** non-text elements: photographs, illustrations, charts (bar, "
+    "line, pie, etc.), diagrams (flowcharts, schematics, etc.), icons, logos, and "
+    "significant layout features (columns, borders, headers, footers if visually "
+    "distinct from main text).    * For each visual element, provide a **detailed "
+    "textual description** embedded at the precise location it appears relative to "
+    "the text. Use the format `[Visual Description: <Detailed Description Here>]`. "
+    "* **Description Content:** * **Type:** Explicitly state the type "
+    "(e.g., \"bar chart,\" \"photograph of a cat,\" \"flowchart\").        * "
+    "**Content:** Describe what is depicted. For data visualizations, include title, "
+    "axis labels, data values/series/trends visible in the image. For diagrams, "
+    "describe components, labels, and connections. For photos/illustrations, describe "
+    "the subject, setting, and key details.        * **Semantic Context:** Briefly "
+    "explain the element's apparent purpose or relationship to the adjacent text "
+    "(e.g., \"illustrating the previous paragraph's point,\" \"providing data for the "
+    "analysis below,\" \"company logo\").  3.  **Integration:** Combine the transcribed "
+    "text and the bracketed visual descriptions into a **single Markdown output**. "
+    "The flow and structure should mirror the original image layout as closely as "
+    "textually possible.  **Constraint:** Do not omit *any* text or visual element. "
+    "Strive for absolute completeness and accuracy in both transcription and "
+    "description. The final output must be a comprehensive textual representation "
+    "capturing the full informational content of the image.  Use the original "
+    "language e.g. german. Avoid unnecessary translation to english. "
+)
+
 OUTPUT_SECTION_HEADER_RE = re.compile(r'^Image:\s*(.+?)\s*$')
+_NON_WORD_RE = re.compile(r'\W+')
+_PAGE_NUMBER_RE = re.compile(r'page_(\d+)')
+# Full-page renders from pdf2pic (page_12.png); crops (page_12_crop_1.jpg) don't match.
+FULL_PAGE_IMAGE_RE = re.compile(r'^page_(\d+)\.[A-Za-z]+$')
 
 
 class OCRPauseException(RuntimeError):
@@ -108,11 +152,11 @@ def sanitize_filename(filename: str) -> str:
     """
     Replace any character that is not alphanumeric or underscore with an underscore.
     """
-    return re.sub(r'\W+', '_', filename)
+    return _NON_WORD_RE.sub('_', filename)
 # --- End helper function ---
 
 def extract_page_number(filename: str) -> int:
-    match = re.search(r'page_(\d+)', filename)
+    match = _PAGE_NUMBER_RE.search(filename)
     return int(match.group(1)) if match else float('inf')
 
 
@@ -548,6 +592,37 @@ def _load_or_initialize_state(
     return loaded_state, page_texts, resume_meta
 
 
+def _apply_text_layer_pages(
+    state: Dict[str, Any],
+    page_texts: Dict[str, str],
+    image_files: List[str],
+    text_layer_pages: Dict[int, str],
+    pid: Any,
+) -> int:
+    """Mark full-page images with a usable PDF text layer as done. Returns the count."""
+    now = _utcnow_iso()
+    applied = 0
+    for image_name in image_files:
+        match = FULL_PAGE_IMAGE_RE.match(image_name)
+        if not match:
+            continue
+        text = text_layer_pages.get(int(match.group(1)))
+        page_state = state["pages"][image_name]
+        if not text or page_state.get("status") == "done":
+            continue
+        page_state["status"] = "done"
+        page_state["last_error"] = None
+        page_state["source"] = "text_layer"
+        page_state["updated_at"] = now
+        page_state.pop("candidates", None)
+        page_state.pop("candidate_models", None)
+        page_texts[image_name] = text
+        applied += 1
+    if applied:
+        print(f"[{pid}] [TEXT-LAYER] {applied} page(s) taken from the PDF text layer, skipping OCR for them.")
+    return applied
+
+
 def _run_ocr_cycle_for_image(
     image_path: str,
     image_name: str,
@@ -561,6 +636,8 @@ def _run_ocr_cycle_for_image(
     pid: Any,
     verbose: bool,
     max_image_kb: int = 0,
+    ocr_cache: Optional[_ocr_cache.OCRCache] = None,
+    base64_image: Optional[str] = None,
 ) -> Tuple[str, Optional[str], str, List[str], List[Tuple[str, int]]]:
     """Run one OCR (+judge) cycle for a page.
 
@@ -570,10 +647,18 @@ def _run_ocr_cycle_for_image(
                                     judge did not adjudicate. candidates/candidate_models
                                     are returned so a later run can re-judge without re-OCR.
       - outcome == "failed":        no usable text; error_text explains why.
+
+    With ocr_cache set, calls whose (payload, model, attempt) already have a
+    successful transcription on disk are answered from the cache, unless the
+    cache is in refresh mode (--no-resume).
+
+    base64_image is the page's already-encoded payload, shared by every OCR
+    call and the judge; when None the image is loaded and encoded here.
     """
-    base64_image_data: Optional[str] = None
+    base64_image_data: Optional[str] = base64_image
     try:
-        base64_image_data = _image_to_base64(image_path, max_kb=max_image_kb)
+        if base64_image_data is None:
+            base64_image_data = _image_to_base64(image_path, max_kb=max_image_kb)
     except Exception as image_err:
         error_text = f"[ERROR: Failed to load/convert image: {image_err}]"
         if verbose:
@@ -582,10 +667,22 @@ def _run_ocr_cycle_for_image(
 
     ocr_futures_map: Dict[concurrent.futures.Future, Tuple[str, int, int]] = {}
     model_info_for_judge_ordered: List[Tuple[str, int]] = []
+    cached_results: Dict[int, str] = {}
+    cache_keys: Dict[int, str] = {}
 
     for model_name, repeat_count in model_repeats:
         for i in range(repeat_count):
             attempt_num = i + 1
+            if ocr_cache is not None:
+                slot = len(model_info_for_judge_ordered)
+                cache_keys[slot] = ocr_cache.ocr_key(base64_image_data, model_name, attempt_num, OCR_PROMPT)
+                cached_text = None if ocr_cache.refresh else ocr_cache.get(cache_keys[slot])
+                if _is_successful_ocr_text(cached_text):
+                    if verbose:
+                        print(f"[{pid}] OCR cache hit for {image_name} ({model_name} Att.{attempt_num})")
+                    cached_results[slot] = cached_text
+                    model_info_for_judge_ordered.append((model_name, attempt_num))
+                    continue
             future = executor.submit(
                 _post_ocr_request,
                 model_name,
@@ -598,11 +695,15 @@ def _run_ocr_cycle_for_image(
             model_info_for_judge_ordered.append((model_name, attempt_num))
 
     ocr_results_for_image_ordered: List[str] = [""] * len(model_info_for_judge_ordered)
+    for slot, cached_text in cached_results.items():
+        ocr_results_for_image_ordered[slot] = cached_text
     for future in concurrent.futures.as_completed(ocr_futures_map):
         model_name_orig, attempt_num_orig, original_idx = ocr_futures_map[future]
         try:
             result_text = future.result()
             ocr_results_for_image_ordered[original_idx] = result_text
+            if ocr_cache is not None and _is_successful_ocr_text(result_text):
+                ocr_cache.put(cache_keys[original_idx], result_text)
         except Exception as future_err:
             ocr_results_for_image_ordered[original_idx] = (
                 f"[ERROR: Future for {model_name_orig} Att.{attempt_num_orig} failed directly: {future_err}]"
@@ -630,7 +731,8 @@ def _run_ocr_cycle_for_image(
                 model_info_for_judge=model_info_for_judge_ordered,
                 judge_decision_log_file=judge_decision_log_file_path,
                 base64_image=base64_image_data if judge_with_image else None,
-                judge_with_image=judge_with_image
+                judge_with_image=judge_with_image,
+                judge_cache=ocr_cache,
             )
         except Exception as judge_exc:
             # Defensive: _post_judge_request swallows known failures, but never
@@ -668,6 +770,7 @@ def _run_judge_only_for_image(
     pid: Any,
     verbose: bool,
     max_image_kb: int = 0,
+    ocr_cache: Optional[_ocr_cache.OCRCache] = None,
 ) -> Tuple[bool, str]:
     """Re-judge stored OCR candidates without re-running OCR.
 
@@ -691,6 +794,7 @@ def _run_judge_only_for_image(
         judge_decision_log_file=judge_decision_log_file_path,
         base64_image=base64_image_data,
         judge_with_image=judge_with_image and base64_image_data is not None,
+        judge_cache=ocr_cache,
     )
     return judged_ok, final_text
 
@@ -763,42 +867,7 @@ def _post_ocr_request(model_name: str, base64_image: str, ocr_log_file: str, ima
             "content": [
                 {
                     "type": "text",
-                    "text": (
-                        "**Critical Task:** Perform a complete and lossless textual reconstruction of the "
-                        "provided image. You are acting as a perfect digital transcriber with visual "
-                        "understanding capabilities.  **Input:** A single image.  **Mandatory Output "
-                        "Requirements:** 1.  **Text Transcription (Verbatim & Formatted):** * "
-                        "Extract **every single character** of text exactly as it appears. Do not "
-                        "summarize or paraphrase.    * Replicate formatting using Markdown: "
-                        "`**Bold**`, `*Italic*`, `- Unordered List`, `1. Ordered List`, ` ``` Code Block "
-                        "```, standard Markdown tables.    * Represent mathematical content "
-                        "accurately: Use `<math>LaTeX expression</math>` for inline math and `<math "
-                        "display=\"block\">LaTeX expression</math>` for display/block equations. Ensure "
-                        "LaTeX is KaTeX compatible.    * Preserve meaningful line breaks and paragraph "
-                        "structures.  2.  **Visual Element Identification & Detailed Description:** * "
-                        "Identify **all** non-text elements: photographs, illustrations, charts (bar, "
-                        "line, pie, etc.), diagrams (flowcharts, schematics, etc.), icons, logos, and "
-                        "significant layout features (columns, borders, headers, footers if visually "
-                        "distinct from main text).    * For each visual element, provide a **detailed "
-                        "textual description** embedded at the precise location it appears relative to "
-                        "the text. Use the format `[Visual Description: <Detailed Description Here>]`. "
-                        "* **Description Content:** * **Type:** Explicitly state the type "
-                        "(e.g., \"bar chart,\" \"photograph of a cat,\" \"flowchart\").        * "
-                        "**Content:** Describe what is depicted. For data visualizations, include title, "
-                        "axis labels, data values/series/trends visible in the image. For diagrams, "
-                        "describe components, labels, and connections. For photos/illustrations, describe "
-                        "the subject, setting, and key details.        * **Semantic Context:** Briefly "
-                        "explain the element's apparent purpose or relationship to the adjacent text "
-                        "(e.g., \"illustrating the previous paragraph's point,\" \"providing data for the "
-                        "analysis below,\" \"company logo\").  3.  **Integration:** Combine the transcribed "
-                        "text and the bracketed visual descriptions into a **single Markdown output**. "
-                        "The flow and structure should mirror the original image layout as closely as "
-                        "textually possible.  **Constraint:** Do not omit *any* text or visual element. "
-                        "Strive for absolute completeness and accuracy in both transcription and "
-                        "description. The final output must be a comprehensive textual representation "
-                        "capturing the full informational content of the image.  Use the original "
-                        "language e.g. german. Avoid unnecessary translation to english. "
-                    )
+                    "text": OCR_PROMPT
                 },
                 {
                     "type": "image_url",
@@ -890,7 +959,8 @@ def _post_judge_request(
     model_info_for_judge: List[Tuple[str, int]],
     judge_decision_log_file: str,
     base64_image: Optional[str] = None,
-    judge_with_image: bool = False
+    judge_with_image: bool = False,
+    judge_cache: Optional[_ocr_cache.OCRCache] = None,
 ) -> Tuple[str, bool]:
     """Adjudicate OCR candidates.
 
@@ -899,6 +969,10 @@ def _post_judge_request(
     response, or empty content, judged_ok is False and final_text falls back to
     the first valid candidate so the OCR text is still usable -- but the caller
     must treat the page as needing a re-judge rather than as fully done.
+
+    With judge_cache set, a verdict for the identical judge request (same judge
+    model, prompt/candidates and image) is replayed instead of re-asking the
+    judge; only real verdicts (judged_ok) are stored.
     """
     pid_str = f"Proc-{os.getpid() if hasattr(os, 'getpid') else 'N/A'}_Thread-{threading.get_ident()}"
     start_time = datetime.now()
@@ -959,6 +1033,21 @@ def _post_judge_request(
         "text": f"{prompt_intro_text}{enumerations_str}\n\nBased on your assessment, please output ONLY the full text of the BEST candidate. Do NOT include the candidate number, model name, or any other commentary. Your response should be solely the chosen text itself."
     })
 
+    judge_cache_key: Optional[str] = None
+    if judge_cache is not None:
+        judge_cache_key = judge_cache.judge_key(
+            judge_model, content_blocks[-1]["text"], base64_image if judge_with_image else None
+        )
+        # Under --no-resume (refresh mode) the verdict is re-judged, then re-stored.
+        cached_verdict = None if judge_cache.refresh else judge_cache.get(judge_cache_key)
+        if cached_verdict:
+            print(f"[{pid_str}] JUDGE CACHE HIT for {image_name}, model {judge_model}")
+            with open(judge_decision_log_file, "a", encoding="utf-8") as df:
+                df.write(f"\n[{pid_str}] [Judge Decision - cached] {start_time.isoformat()}\n")
+                df.write(f"Image: {image_name}\nJudge Model: {judge_model}\nJudge with image: {judge_with_image}\n")
+                df.write(f"--- Judge Picked ---\n{cached_verdict}\n-------------------------------------\n")
+            return cached_verdict, True
+
     request_payload = {"model": judge_model, "messages": [{"role": "user", "content": content_blocks}]}
     final_text = f"[ERROR: Judge request for {judge_model} did not complete successfully]"
     response_data_judge = None
@@ -1023,6 +1112,8 @@ def _post_judge_request(
             m_name, att_num = valid_model_info_for_judge[i]
             df.write(f"Candidate {i + 1} (Model: {m_name}, Attempt: {att_num}):\n{text_candidate}\n---\n")
         df.write(f"--- Judge Picked ---\n{final_text}\n-------------------------------------\n")
+    if judged_ok and judge_cache_key is not None:
+        judge_cache.put(judge_cache_key, final_text)
     return final_text, judged_ok
 
 def _archive_old_logs(output_file_path_str: str, log_files_to_archive: List[str]) -> None:
@@ -1069,6 +1160,7 @@ def _process_single_page(
     state_lock: threading.RLock,
     pause_event: threading.Event,
     max_image_kb: int = 0,
+    ocr_cache: Optional[_ocr_cache.OCRCache] = None,
 ) -> bool:
     """Process a single page with retries. Mutates state, page_texts, and counters.
 
@@ -1082,7 +1174,11 @@ def _process_single_page(
     """
     with state_lock:
         page_state = state["pages"][image_name]
-        already_done = page_state.get("status") == "done" and not no_resume
+        # Text-layer pages were filled in by this run, not resumed -- they stay
+        # done under --no-resume too.
+        already_done = page_state.get("status") == "done" and (
+            not no_resume or page_state.get("source") == "text_layer"
+        )
 
     if already_done:
         if verbose:
@@ -1117,6 +1213,7 @@ def _process_single_page(
             pid=pid,
             verbose=verbose,
             max_image_kb=max_image_kb,
+            ocr_cache=ocr_cache,
         )
         with state_lock:
             page_state["updated_at"] = _utcnow_iso()
@@ -1159,6 +1256,12 @@ def _process_single_page(
         attempts_used = int(page_state.get("attempts_used", 0))
     page_completed = False
 
+    # Encode the page once: every retry cycle uploads the identical payload.
+    try:
+        page_base64: Optional[str] = _image_to_base64(image_path, max_kb=max_image_kb)
+    except Exception:
+        page_base64 = None  # each cycle retries the load and reports the error
+
     for attempt_idx in range(attempts_used + 1, max_page_attempts + 1):
         if pause_event.is_set():
             # Another page triggered a pause; stop retrying so the pool drains.
@@ -1195,6 +1298,8 @@ def _process_single_page(
             pid=pid,
             verbose=verbose,
             max_image_kb=max_image_kb,
+            ocr_cache=ocr_cache,
+            base64_image=page_base64,
         )
 
         with state_lock:
@@ -1336,7 +1441,16 @@ def convert_images_to_text(
     verbose: bool = False,
     max_concurrent_pages: int = 1,
     max_image_kb: int = DEFAULT_MAX_IMAGE_KB,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    text_layer_pages: Optional[Dict[int, str]] = None,
 ) -> str:
+    """OCR every image in images_dir into output_file (resumable).
+
+    text_layer_pages maps 1-based page numbers to text taken from the PDF's own
+    text layer; matching full-page images are marked done with that text and
+    never sent to the OCR API.
+    """
     pid = os.getpid() if hasattr(os, 'getpid') else 'main'
     if verbose:
         print(
@@ -1392,7 +1506,7 @@ def convert_images_to_text(
         print(f"[{pid}] OCR log for this worker: {ocr_log_file_path}")
         print(f"[{pid}] Judge log for this worker: {judge_decision_log_file_path}")
 
-    image_files = [f for f in os.listdir(images_dir) if f.lower().endswith((".png", ".jpg", ".jpeg"))]
+    image_files = [f for f in os.listdir(images_dir) if f.lower().endswith((".png", ".jpg", ".jpeg", ".webp"))]
     image_files.sort(key=extract_page_number)
 
     images_fingerprint = _compute_images_fingerprint(images_dir, image_files)
@@ -1409,6 +1523,9 @@ def convert_images_to_text(
         verbose=verbose
     )
 
+    if text_layer_pages:
+        _apply_text_layer_pages(state, page_texts, image_files, text_layer_pages, pid)
+
     # Immediately materialize "known-good only" output; this removes stale [ERROR] sections from prior runs.
     _write_output_sections_atomic(output_file_path, image_files, page_texts)
     _write_json_atomic(state_file_path, state)
@@ -1459,6 +1576,10 @@ def convert_images_to_text(
     }
     state_lock = threading.RLock()
     pause_event = threading.Event()
+    # --no-resume means "transcribe again": skip cache lookups, keep writing.
+    ocr_cache = _ocr_cache.open_cache(use_cache, cache_dir, refresh=no_resume)
+    if ocr_cache is not None and verbose:
+        print(f"[{pid}] OCR cache: {ocr_cache.cache_dir}")
 
     # Size the API-call pool so concurrent pages don't starve each other.
     # Each page may fan out up to total_api_calls_per_image requests; cap at 20
@@ -1504,6 +1625,7 @@ def convert_images_to_text(
                         state_lock=state_lock,
                         pause_event=pause_event,
                         max_image_kb=max_image_kb,
+                        ocr_cache=ocr_cache,
                     )
             else:
                 with concurrent.futures.ThreadPoolExecutor(
@@ -1541,6 +1663,7 @@ def convert_images_to_text(
                             state_lock=state_lock,
                             pause_event=pause_event,
                             max_image_kb=max_image_kb,
+                            ocr_cache=ocr_cache,
                         )
                         futures.append(fut)
 
@@ -303,7 +303,7 @@ def _run_pending_ocr(
     safe_print(f"\n--- OCR: {len(pending)} PDF(s) ausstehend ---")
 
     resolved_concurrency = _perf_tuner.resolve_concurrency(ocr_model, max_concurrent_pages)
-    if max_concurrent_pages is None and not _perf_tuner.is_disabled():
+    if _perf_tuner.tuner_decides(max_concurrent_pages):
         safe_print(f"  Auto-tuner: max_concurrent_pages={resolved_concurrency} for {ocr_model}")
 
     if len(pending) == 1:
@@ -311,7 +311,8 @@ def _run_pending_ocr(
             base_dir, pending[0], ocr_model, resolved_concurrency, max_image_kb,
         )
 
-    num_workers = min(len(pending), max(1, int((os.cpu_count() or 1) * 0.6)))
+    from ..core import available_cpus
+    num_workers = min(len(pending), max(1, int(available_cpus() * 0.6)))
     safe_print(f"  Multi-PDF parallel: {num_workers} Worker-Prozess(e).")
 
     produced: list[Path] = []
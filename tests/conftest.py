@@ -8,6 +8,9 @@ from unittest.mock import MagicMock
 # Suppress the per-model OCR concurrency tuner across the test suite so that
 # pause/error paths in pic2text tests don't write to ~/.pdf2anki/perf_log.ndjson.
 os.environ.setdefault("PDF2ANKI_DISABLE_TUNER", "1")
+# Likewise keep OCR responses out of ~/.pdf2anki/ocr_cache; cache tests lift
+# this with monkeypatch and point cache_dir at tmp_path.
+os.environ.setdefault("PDF2ANKI_DISABLE_OCR_CACHE", "1")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -49,6 +49,16 @@ class TestLoadConfig:
             core.load_config()
         assert new_dir.exists()
 
+    def test_existing_file_skips_mkdir(self, tmp_path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{}", encoding="utf-8")
+        import pdf2anki.core as core
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file), \
+             patch.object(Path, "mkdir") as mkdir:
+            assert core.load_config() == {}
+        mkdir.assert_not_called()
+
 
 class TestSaveConfig:
     def test_writes_json_to_file(self, tmp_path):
@@ -80,6 +90,101 @@ class TestSaveConfig:
             loaded = core.load_config()
         assert loaded == original
 
+    def test_identical_content_is_not_rewritten(self, tmp_path):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            core.save_config({"default_model": "m"})
+            with patch.object(core.os, "replace") as replace:
+                core.save_config({"default_model": "m"})
+        replace.assert_not_called()
+
+    def test_failed_write_keeps_old_file(self, tmp_path, capsys):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            core.save_config({"default_model": "old"})
+            with patch.object(core.os, "replace", side_effect=OSError("disk full")):
+                core.save_config({"default_model": "new"})
+        assert json.loads(config_file.read_text(encoding="utf-8")) == {"default_model": "old"}
+        assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+        assert "Could not write config file" in capsys.readouterr().out
+
+
+class TestConfigCache:
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"default_model": "m"}), encoding="utf-8")
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file), \
+             patch.object(core, "_json_loads", wraps=core._json_loads) as parse:
+            assert core.load_config() == {"default_model": "m"}
+            assert core.load_config() == {"default_model": "m"}
+        assert parse.call_count == 1
+
+    def test_returned_dict_is_a_private_copy(self, tmp_path):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"defaults": {"model": ["m"]}}), encoding="utf-8")
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            core.load_config()["defaults"]["model"].append("mutated")
+            assert core.load_config() == {"defaults": {"model": ["m"]}}
+
+    def test_external_edit_is_picked_up(self, tmp_path):
+        import os
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"default_model": "old"}), encoding="utf-8")
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            assert core.load_config()["default_model"] == "old"
+            config_file.write_text(json.dumps({"default_model": "newer"}), encoding="utf-8")
+            st = config_file.stat()
+            os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            assert core.load_config()["default_model"] == "newer"
+
+    def test_save_then_load_sees_new_values(self, tmp_path):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            core.save_config({"default_model": "a"})
+            assert core.load_config() == {"default_model": "a"}
+            core.save_config({"default_model": "b"})
+            assert core.load_config() == {"default_model": "b"}
+
+
+class TestConfigJsonCodec:
+    SAMPLE = {"default_model": "m", "defaults": {"model": ["a", "b"], "repeat": [2, 1]},
+              "note": "Übung", "flag": True, "nothing": None}
+
+    def test_stdlib_fallback_roundtrip(self, monkeypatch):
+        import pdf2anki.core as core
+        monkeypatch.setattr(core, "_orjson", None)
+        data = core._json_dumps(self.SAMPLE)
+        assert core._json_loads(data) == self.SAMPLE
+
+    def test_orjson_and_stdlib_write_identical_bytes(self, monkeypatch):
+        import pdf2anki.core as core
+        if core._orjson is None:
+            pytest.skip("orjson not installed")
+        with_orjson = core._json_dumps(self.SAMPLE)
+        monkeypatch.setattr(core, "_orjson", None)
+        assert core._json_dumps(self.SAMPLE) == with_orjson
+
+    def test_invalid_utf8_config_is_a_warning(self, tmp_path, capsys):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        config_file.write_bytes(b'{"default_model": "\xff"}')
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            assert core.load_config() == {}
+        assert "[WARN]" in capsys.readouterr().out
+
 
 class TestGetDefaultModel:
     def test_returns_model_from_config(self):
@@ -136,3 +241,53 @@ class TestPreflightValidateModels:
         with patch("pdf2anki.pic2text.fetch_available_model_ids") as fetch:
             core._preflight_validate_models(self._args(["bogus/model"]))
             fetch.assert_not_called()
+
+
+class TestSetConfigDefaults:
+    def _set(self, tmp_path, *values):
+        import argparse
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            core.set_config_value(argparse.Namespace(key="defaults", values=list(values)))
+            return core.load_config()
+
+    def test_subkeys_are_parsed_by_type(self, tmp_path):
+        self._set(tmp_path, "model", "a/m, b/m")
+        self._set(tmp_path, "repeat", "2,3")
+        self._set(tmp_path, "judge_model", "  ")
+        config = self._set(tmp_path, "judge_with_image", "Yes")
+        assert config["defaults"] == {
+            "model": ["a/m", "b/m"], "repeat": [2, 3], "judge_model": None, "judge_with_image": True,
+        }
+
+    def test_invalid_values_and_subkeys_are_rejected(self, tmp_path, capsys):
+        assert self._set(tmp_path, "judge_with_image", "maybe") == {}
+        assert self._set(tmp_path, "colour", "red") == {}
+        out = capsys.readouterr().out
+        assert "Invalid boolean: 'maybe'" in out
+        assert "Valid subkeys: model, repeat, judge_model, judge_mode, judge_with_image" in out
+
+    def test_json_object_is_echoed_as_given(self, tmp_path, capsys):
+        config = self._set(tmp_path, '{"model": ["x/m"], "repeat": [2]}')
+        assert config["defaults"] == {"model": ["x/m"], "repeat": [2]}
+        assert 'JSON object: {"model": ["x/m"], "repeat": [2]}' in capsys.readouterr().out
+
+
+class TestReadWithStat:
+    def test_returns_content_and_stat_of_same_file(self, tmp_path):
+        import pdf2anki.core as core
+        path = tmp_path / "config.json"
+        path.write_bytes(b'{"a": 1}' * 2000)
+        data, st = core._read_with_stat(path)
+        assert data == path.read_bytes() and st.st_size == len(data)
+
+    def test_empty_config_file_is_an_empty_config(self, tmp_path, capsys):
+        import pdf2anki.core as core
+        config_file = tmp_path / "config.json"
+        config_file.write_bytes(b"")
+        with patch.object(core, "CONFIG_DIR", tmp_path), \
+             patch.object(core, "CONFIG_FILE", config_file):
+            assert core.load_config() == {}
+        assert "WARN" not in capsys.readouterr().out
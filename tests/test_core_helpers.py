@@ -0,0 +1,416 @@
+"""Tests for pdf2anki.core: small argument/plumbing helpers."""
+import argparse
+from pathlib import Path
+
+import pytest
+
+import pdf2anki.core as core
+
+
+class TestBuildModelRepeats:
+    def test_repeats_paired_by_position(self):
+        assert core._build_model_repeats(["a", "b"], [2, 3]) == [("a", 2), ("b", 3)]
+
+    def test_missing_repeats_default_to_one(self):
+        assert core._build_model_repeats(["a", "b", "c"], [4]) == [("a", 4), ("b", 1), ("c", 1)]
+
+    def test_surplus_repeats_are_ignored(self):
+        assert core._build_model_repeats(["a"], [2, 5, 7]) == [("a", 2)]
+
+    @pytest.mark.parametrize("models,repeats", [([], []), (None, None), ([], [3])])
+    def test_no_models_gives_empty_list(self, models, repeats):
+        assert core._build_model_repeats(models, repeats) == []
+
+
+class TestBatchWorkerCount:
+    @pytest.fixture(autouse=True)
+    def _no_env(self, monkeypatch):
+        monkeypatch.delenv("PDF2ANKI_WORKERS", raising=False)
+
+    def test_jobs_overrides_cpu_default(self):
+        assert core._batch_worker_count(10, jobs=3) == (3, "--jobs")
+
+    def test_never_more_workers_than_items(self):
+        assert core._batch_worker_count(2, jobs=8)[0] == 2
+
+    def test_default_is_sixty_percent_of_cores(self, monkeypatch):
+        monkeypatch.setattr(core, "available_cpus", lambda: 10)
+        assert core._batch_worker_count(100)[0] == 6
+        monkeypatch.setattr(core, "available_cpus", lambda: 1)
+        assert core._batch_worker_count(100)[0] == 1
+
+    def test_available_cpus_honours_affinity(self, monkeypatch):
+        monkeypatch.setattr(core.os, "sched_getaffinity", lambda pid: {0, 1, 2, 3}, raising=False)
+        monkeypatch.setattr(core.os, "cpu_count", lambda: 64)
+        assert core.available_cpus() == 4
+
+    def test_available_cpus_without_affinity_support(self, monkeypatch):
+        monkeypatch.delattr(core.os, "sched_getaffinity", raising=False)
+        monkeypatch.setattr(core.os, "cpu_count", lambda: None)
+        assert core.available_cpus() == 1
+
+    def test_env_override_between_jobs_and_auto(self, monkeypatch):
+        monkeypatch.setenv("PDF2ANKI_WORKERS", "12")
+        assert core._batch_worker_count(100) == (12, "PDF2ANKI_WORKERS")
+        assert core._batch_worker_count(100, jobs=2) == (2, "--jobs")
+
+    @pytest.mark.parametrize("raw", ["0", "-2", "lots", ""])
+    def test_invalid_env_falls_back_to_auto(self, monkeypatch, raw):
+        monkeypatch.setenv("PDF2ANKI_WORKERS", raw)
+        monkeypatch.setattr(core, "available_cpus", lambda: 10)
+        assert core._batch_worker_count(100) == (6, "auto: 0.6 x CPU cores")
+
+
+class TestMakePic2textArgs:
+    def test_copies_resolved_ocr_settings(self):
+        src = argparse.Namespace(
+            model=["m"], repeat=[2], judge_model="j", judge_mode="authoritative",
+            ensemble_strategy=None, trust_score=None, judge_with_image=True,
+            max_concurrent_pages=3, verbose=True,
+        )
+        ns = core._make_pic2text_args("imgs", "out.txt", src)
+        assert ns.images_dir == "imgs" and ns.output_file == "out.txt"
+        assert ns.model == ["m"] and ns.repeat == [2] and ns.judge_model == "j"
+        assert ns.judge_with_image is True and ns.max_concurrent_pages == 3
+        # Optional flags absent on the source fall back to their defaults.
+        assert ns.no_resume is False and ns.max_page_attempts == 40
+        assert ns.no_cache is False and ns.cache_dir is None
+
+
+class TestOCRSettings:
+    def _args(self, **overrides):
+        values = dict(
+            model=["m1", "m2"], repeat=[2], judge_model="j", judge_mode="authoritative",
+            ensemble_strategy=None, trust_score=None, judge_with_image=False,
+        )
+        values.update(overrides)
+        return argparse.Namespace(**values)
+
+    def test_from_args_maps_cli_names(self):
+        settings = core.OCRSettings.from_args(self._args(no_cache=True, cache_dir="c", verbose=True))
+        assert settings.models == ("m1", "m2") and settings.repeats == (2,)
+        assert settings.use_cache is False and settings.cache_dir == "c"
+        assert settings.max_page_attempts == 40 and settings.max_image_kb is None
+        assert settings.verbose is True
+
+    def test_is_frozen(self):
+        import dataclasses
+        settings = core.OCRSettings.from_args(self._args())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.judge_model = "other"
+
+    def test_kwargs_match_run_pic2text(self):
+        import inspect
+        params = set(inspect.signature(core.run_pic2text).parameters)
+        kwargs = core.OCRSettings.from_args(self._args()).as_kwargs()
+        assert set(kwargs) <= params
+        assert params - set(kwargs) == {"images_dir", "output_file", "text_layer_pages"}
+
+
+class TestRunPic2text:
+    def test_forwards_pairs_and_defaults(self):
+        from unittest.mock import patch
+        with patch.object(core.pic2text, "convert_images_to_text") as conv:
+            core.run_pic2text(
+                images_dir="imgs", output_file="out.txt",
+                models=["m1", "m2"], repeats=[2], max_concurrent_pages=1,
+            )
+        kwargs = conv.call_args.kwargs
+        assert kwargs["model_repeats"] == [("m1", 2), ("m2", 1)]
+        assert kwargs["max_concurrent_pages"] == 1
+        assert kwargs["max_image_kb"] == core.pic2text.DEFAULT_MAX_IMAGE_KB
+        assert kwargs["use_cache"] is True
+
+    def test_no_models_raises(self):
+        with pytest.raises(ValueError):
+            core.run_pic2text(images_dir="imgs", output_file="out.txt", models=[])
+
+
+class TestLazySubmoduleImports:
+    def test_importing_core_does_not_load_heavy_submodules(self):
+        import subprocess
+        import sys
+        code = (
+            "import sys, pdf2anki.core; "
+            "print(sorted(m for m in ('pdf2anki.pdf2pic', 'pdf2anki.pic2text', "
+            "'pdf2anki.text2anki', 'pymupdf', 'genanki') if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "[]"
+
+    def test_submodules_reachable_as_attributes(self):
+        import pdf2anki.pic2text
+        assert core.pic2text is pdf2anki.pic2text
+
+    def test_help_default_matches_pic2text(self):
+        assert core._DEFAULT_MAX_IMAGE_KB_HELP == core.pic2text.DEFAULT_MAX_IMAGE_KB
+
+    def test_image_format_choices_match_pdf2pic(self):
+        assert core._IMAGE_FORMAT_CHOICES == tuple(core.pdf2pic.PAGE_IMAGE_FORMATS)
+
+
+class TestCommandRegistry:
+    def _subparsers(self):
+        parser = argparse.ArgumentParser()
+        sub = parser.add_subparsers(dest="command")
+        for add_command in core._COMMANDS.values():
+            add_command(sub)
+        return sub.choices
+
+    def test_registers_every_command(self):
+        assert list(self._subparsers()) == [
+            "pdf2pic", "pic2text", "pdf2text", "text2anki",
+            "json2anki", "process", "workflow", "config", "cache",
+        ]
+
+    def test_ocr_commands_share_flag_defaults(self):
+        choices = self._subparsers()
+        defaults = {
+            name: vars(choices[name].parse_args(argv))
+            for name, argv in (
+                ("pic2text", ["imgs"]),
+                ("pdf2text", ["doc.pdf"]),
+                ("process", ["doc.pdf", "imgs", "out.apkg"]),
+            )
+        }
+        for key, expected in core._PARSER_OCR_DEFAULTS.items():
+            assert {d[key] == expected for d in defaults.values()} == {True}, key
+        assert defaults["pdf2text"]["ocr_threshold"] == defaults["process"]["ocr_threshold"] == 0
+        assert "ocr_threshold" not in defaults["pic2text"]
+
+    def test_rectangles_parsed_at_cli_time(self):
+        ns = self._subparsers()["pdf2pic"].parse_args(["doc.pdf", "out", "0,0,10,20", " 1, 2, 3, 4 "])
+        assert ns.rectangles == [(0, 0, 10, 20), (1, 2, 3, 4)]
+
+    def test_jobs_flag_on_batch_commands(self):
+        choices = self._subparsers()
+        assert choices["pdf2text"].parse_args(["dir", "-j", "3"]).jobs == 3
+        assert choices["pic2text"].parse_args(["dir"]).jobs is None
+        with pytest.raises(SystemExit):
+            choices["pdf2text"].parse_args(["dir", "--jobs", "0"])
+
+    @pytest.mark.parametrize("argv,expected", [
+        (["pic2text", "imgs"], "pic2text"),
+        (["-v", "process", "a.pdf"], "process"),
+        (["--help"], None),
+        (["-h", "pdf2pic"], None),
+        (["pdf2pic", "-h"], "pdf2pic"),
+        (["nonsense"], None),
+        ([], None),
+    ])
+    def test_requested_command(self, argv, expected):
+        assert core._requested_command(argv) == expected
+
+    def test_parser_for_one_command_parses_it(self):
+        ns = core._build_parser("pdf2text").parse_args(["pdf2text", "doc.pdf", "-j", "2"])
+        assert ns.command == "pdf2text" and ns.jobs == 2
+        with pytest.raises(SystemExit):
+            core._build_parser("pdf2text").parse_args(["pic2text", "imgs"])
+
+    def test_top_level_help_matches_fully_built_parser(self):
+        full = core._build_parser("pdf2pic")
+        sub = next(a for a in full._actions if isinstance(a, argparse._SubParsersAction))
+        for name, add_command in core._COMMANDS.items():
+            if name != "pdf2pic":
+                add_command(sub)
+        assert list(core._COMMAND_HELP) == list(core._COMMANDS)
+        assert core._build_parser().format_help() == full.format_help()
+
+    def test_dispatch_target_defaults_to_none(self):
+        assert core._build_parser().parse_known_args(["pdf2pic"])[0].func_name is None
+        assert core._build_parser("config").parse_args(["config", "view"]).func_name == "view_config"
+
+    def test_parsers_are_memoized_per_command(self):
+        assert core._get_parser("config") is core._get_parser("config")
+        assert core._get_parser("config") is not core._get_parser(None)
+
+    def test_cli_invoke_takes_explicit_argv(self):
+        from unittest.mock import patch
+        with patch.object(core, "images_to_text") as handler:
+            core.cli_invoke(["pic2text", "imgs", "--model", "m"])
+            core.cli_invoke(["pic2text", "other"])
+        first, second = (c.args[0] for c in handler.call_args_list)
+        assert first.images_dir == "imgs" and first.model == ["m"]
+        assert second.images_dir == "other" and second.model == []
+
+    def test_cli_invoke_dispatches_current_handler(self, tmp_path):
+        from unittest.mock import patch
+        core.cli_invoke(["cache", "info", "--cache-dir", str(tmp_path)])
+        with patch.object(core, "cache_command") as handler:
+            core.cli_invoke(["cache", "info"])
+        handler.assert_called_once()
+
+    def test_bad_rectangle_is_a_usage_error(self, capsys):
+        with pytest.raises(SystemExit) as exc:
+            self._subparsers()["pdf2text"].parse_args(["doc.pdf", "out", "0,0,10"])
+        assert exc.value.code == 2
+        assert "Invalid rectangle definition" in capsys.readouterr().err
+
+
+class TestProcessIntermediateText:
+    def _run(self, tmp_path, seen, fake_text_to_anki=None, **extra):
+        from unittest.mock import patch
+
+        def fake_ocr(*, images_dir, output_file, **kwargs):
+            Path(output_file).write_text("page text", encoding="utf-8")
+            Path(output_file).with_name("ocr_run1.log").write_text("ocr log", encoding="utf-8")
+            seen["ocr"] = output_file
+
+        args = argparse.Namespace(
+            pdf_path=str(tmp_path / "doc.pdf"), output_dir=str(tmp_path / "imgs"),
+            anki_file=str(tmp_path / "deck.apkg"), anki_model="anki/model",
+            model=["ocr/model"], repeat=[], judge_model=None, judge_mode="authoritative",
+            ensemble_strategy=None, trust_score=None,
+            judge_with_image=False, no_resume=False, max_page_attempts=40,
+            max_image_kb=None, ocr_threshold=0, **extra,
+        )
+        with patch.object(core, "load_config", return_value={}), \
+             patch.object(core, "pdf_to_images"), \
+             patch.object(core, "run_pic2text", side_effect=fake_ocr), \
+             patch.object(core, "text_to_anki", side_effect=fake_text_to_anki):
+            core.process_pdf_to_anki(args)
+
+    def test_keep_intermediate_copies_text_next_to_deck(self, tmp_path):
+        seen = {}
+        self._run(tmp_path, seen, keep_intermediate=True)
+        assert (tmp_path / "deck_ocr.txt").read_text(encoding="utf-8") == "page text"
+        assert (tmp_path / "ocr_run1.log").read_text(encoding="utf-8") == "ocr log"
+        assert not Path(seen["ocr"]).parent.exists()
+
+    def test_ocr_text_lives_in_removed_temp_dir(self, tmp_path):
+        seen = {}
+
+        def fake_text_to_anki(ns, config=None):
+            seen["text"] = ns.text_file
+            seen["config"] = config
+            assert Path(ns.text_file).read_text(encoding="utf-8") == "page text"
+
+        self._run(tmp_path, seen, fake_text_to_anki=fake_text_to_anki)
+
+        assert seen["ocr"] == seen["text"]
+        assert seen["config"] == {}
+        assert Path(seen["text"]).parent != tmp_path
+        assert not Path(seen["text"]).parent.exists()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestPic2textBatchExecutor:
+    def test_auto_and_thread_use_threads(self):
+        import concurrent.futures
+        assert core._batch_executor_class("auto") is concurrent.futures.ThreadPoolExecutor
+        assert core._batch_executor_class("thread") is concurrent.futures.ThreadPoolExecutor
+        assert core._batch_executor_class("process") is concurrent.futures.ProcessPoolExecutor
+
+    def test_batch_runs_every_subdir_on_threads(self, tmp_path, monkeypatch):
+        from PIL import Image
+        for name in ("doc_a", "doc_b"):
+            (tmp_path / "in" / name).mkdir(parents=True)
+            Image.new("RGB", (4, 4)).save(tmp_path / "in" / name / "page_1.png")
+        seen = []
+        monkeypatch.setattr(core, "load_config", lambda: {})
+        monkeypatch.setattr(core, "_apply_ocr_presets_and_resolve_model", lambda a, c: None)
+        monkeypatch.setattr(core, "_run_single_dir_ocr", lambda a: seen.append(Path(a.output_file).name))
+
+        args = argparse.Namespace(
+            images_dir=str(tmp_path / "in"), output_file=str(tmp_path / "out"),
+            model=["m"], repeat=[], judge_model=None, judge_mode="authoritative",
+            ensemble_strategy=None, trust_score=None, judge_with_image=False,
+            jobs=2, executor="auto", verbose=False,
+        )
+        core.images_to_text(args)
+
+        assert sorted(seen) == ["doc_a.txt", "doc_b.txt"]
+
+
+class TestPdfWorkerInitializer:
+    def test_worker_uses_settings_installed_by_initializer(self, tmp_path, monkeypatch):
+        seen = {}
+        monkeypatch.setattr(core, "pdf_to_images", lambda a: seen.setdefault("images", a.output_dir))
+        monkeypatch.setattr(core, "_run_single_dir_ocr", lambda a: seen.setdefault("text", a.output_file))
+        monkeypatch.setattr(core, "_pdf_worker_common_args", None)
+
+        core._init_pdf_worker(dict(
+            rectangles=[], output_dir=str(tmp_path / "imgs"), output_file=str(tmp_path / "txt"),
+            model=["m"], repeat=[], judge_model=None, judge_mode="authoritative",
+            ensemble_strategy=None, trust_score=None, judge_with_image=False,
+            ocr_threshold=0, _is_batch_mode=True, _is_recursive=False,
+            _batch_output_dirs=(str(tmp_path / "imgs"), str(tmp_path / "txt")),
+        ))
+        assert core._process_pdf_worker(str(tmp_path / "doc.pdf")) == "SUCCESS: doc.pdf"
+        assert Path(seen["images"]) == tmp_path / "imgs" / "doc"
+        assert Path(seen["text"]) == tmp_path / "txt" / "doc.txt"
+
+
+class TestDebugTrace:
+    def test_silent_without_verbose(self, capsys):
+        core._debug(argparse.Namespace(), "never %s", "shown")
+        core._debug(argparse.Namespace(verbose=False), "never %s", "shown")
+        assert capsys.readouterr().out == ""
+
+    def test_prefixes_pid_when_verbose(self, capsys):
+        import os
+        core._debug(argparse.Namespace(verbose=True), "done %s: %d%%", "doc.pdf", 50)
+        assert capsys.readouterr().out == f"[{os.getpid()}] done doc.pdf: 50%\n"
+
+    @pytest.mark.skipif(not hasattr(__import__("os"), "fork"), reason="needs os.fork")
+    def test_pid_tag_follows_fork(self):
+        import os
+        assert core._PID_TAG == f"[{os.getpid()}]"
+        read_fd, write_fd = os.pipe()
+        child = os.fork()
+        if child == 0:
+            os.write(write_fd, core._PID_TAG.encode())
+            os._exit(0)
+        os.close(write_fd)
+        os.waitpid(child, 0)
+        with os.fdopen(read_fd) as f:
+            assert f.read() == f"[{child}]"
+
+
+class TestListPdfs:
+    def test_only_regular_pdf_files_sorted(self, tmp_path):
+        for name in ("b.pdf", "a.PDF", "notes.txt"):
+            (tmp_path / name).write_bytes(b"%PDF")
+        (tmp_path / "folder.pdf").mkdir()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "nested.pdf").write_bytes(b"%PDF")
+        assert [p.name for p in core._list_pdfs(tmp_path)] == ["a.PDF", "b.pdf"]
+
+
+class TestResolveAnkiModel:
+    def test_cli_value_wins_without_touching_config(self):
+        from unittest.mock import patch
+        with patch.object(core, "get_default_anki_model") as default:
+            assert core._resolve_anki_model(argparse.Namespace(anki_model="cli/m"), {}, "process") == "cli/m"
+        default.assert_not_called()
+
+    def test_falls_back_to_configured_default(self, capsys):
+        args = argparse.Namespace(anki_model=None)
+        assert core._resolve_anki_model(args, {"default_anki_model": "cfg/m"}, "text2anki") == "cfg/m"
+        assert "for 'text2anki': cfg/m" in capsys.readouterr().out
+
+    def test_exits_when_nothing_resolves(self, monkeypatch):
+        monkeypatch.setattr(core, "get_default_anki_model", lambda config, interactive: None)
+        with pytest.raises(SystemExit):
+            core._resolve_anki_model(argparse.Namespace(anki_model=None), {}, "process")
+
+
+class TestBatchOutputDirs:
+    def test_defaults_to_cwd(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        args = argparse.Namespace(output_dir=None, output_file=None)
+        assert core._batch_output_dirs(args) == (str(tmp_path / "pdf2pic"), str(tmp_path))
+
+    def test_file_like_output_means_its_parent(self, tmp_path):
+        args = argparse.Namespace(output_dir=str(tmp_path / "imgs"), output_file=str(tmp_path / "out" / "all.txt"))
+        assert core._batch_output_dirs(args) == (str(tmp_path / "imgs"), str(tmp_path / "out"))
+
+
+class TestApplyOcrPresets:
+    def test_presets_fill_only_values_left_at_parser_defaults(self, monkeypatch):
+        monkeypatch.setattr(core, "_preflight_validate_models", lambda a: None)
+        args = core._build_parser("pic2text").parse_args(["pic2text", "imgs", "--max-page-attempts", "5"])
+        config = {"defaults": {"model": ["preset/m"], "judge_with_image": True, "max_page_attempts": 9}}
+        core._apply_ocr_presets_and_resolve_model(args, config)
+        assert args.model == ["preset/m"] and args.judge_with_image is True
+        assert args.max_page_attempts == 5
@@ -0,0 +1,237 @@
+"""Tests for pdf2anki.ocr_cache — content-addressed OCR response cache."""
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pdf2anki import ocr_cache
+from pdf2anki.ocr_cache import OCRCache
+from pdf2anki.pic2text import convert_images_to_text
+
+from tests.test_pic2text import make_png_image, make_mock_ocr_response
+
+
+@pytest.fixture
+def cache_enabled(monkeypatch):
+    monkeypatch.setenv("PDF2ANKI_DISABLE_OCR_CACHE", "0")
+
+
+class TestOCRCacheStore:
+    def test_miss_returns_none(self, tmp_path):
+        assert OCRCache(str(tmp_path)).get("00" * 16) is None
+
+    def test_put_get_roundtrip(self, tmp_path):
+        cache = OCRCache(str(tmp_path))
+        key = cache.ocr_key("aGVsbG8=", "ocr/model", 1, "prompt")
+        cache.put(key, "Erkannter Text äöü")
+        assert cache.get(key) == "Erkannter Text äöü"
+        assert (tmp_path / key[:2] / f"{key}.txt").exists()
+
+    def test_judge_key_depends_on_prompt_and_image(self):
+        base = OCRCache.judge_key("judge/m", "prompt with candidates")
+        assert base == OCRCache.judge_key("judge/m", "prompt with candidates", None)
+        assert base != OCRCache.judge_key("judge/m2", "prompt with candidates")
+        assert base != OCRCache.judge_key("judge/m", "other candidates")
+        assert base != OCRCache.judge_key("judge/m", "prompt with candidates", "aW1n")
+        assert base != OCRCache.ocr_key("", "judge/m", 1, "prompt with candidates")
+
+    def test_key_depends_on_every_component(self):
+        base = OCRCache.ocr_key("img", "m", 1, "p")
+        assert base == OCRCache.ocr_key("img", "m", 1, "p")
+        assert base != OCRCache.ocr_key("img2", "m", 1, "p")
+        assert base != OCRCache.ocr_key("img", "m2", 1, "p")
+        assert base != OCRCache.ocr_key("img", "m", 2, "p")
+        assert base != OCRCache.ocr_key("img", "m", 1, "p2")
+
+    def test_usage_and_clear(self, tmp_path):
+        cache = OCRCache(str(tmp_path / "cache"))
+        cache.put("ab" * 16, "one")
+        cache.put("cd" * 16, "two!")
+        # Left behind by an interrupted put(): not an entry, but cleared.
+        leftover = tmp_path / "cache" / "ab" / f"{'ab' * 16}.txt.123.456.tmp"
+        leftover.write_text("partial", encoding="utf-8")
+        assert cache.usage() == (2, 7)
+        assert cache.clear() == 2
+        assert not leftover.exists()
+        assert cache.usage() == (0, 0)
+        assert cache.get("ab" * 16) is None
+
+    def test_unwritable_dir_is_a_silent_miss(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        cache = OCRCache(str(blocker))
+        cache.put("ab" * 16, "text")  # must not raise
+        assert cache.get("ab" * 16) is None
+
+
+class TestOpenCache:
+    def test_disabled_by_flag(self, tmp_path, cache_enabled):
+        assert ocr_cache.open_cache(use_cache=False, cache_dir=str(tmp_path)) is None
+
+    def test_disabled_by_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PDF2ANKI_DISABLE_OCR_CACHE", "1")
+        assert ocr_cache.open_cache(cache_dir=str(tmp_path)) is None
+
+    def test_enabled_uses_cache_dir(self, tmp_path, cache_enabled):
+        cache = ocr_cache.open_cache(cache_dir=str(tmp_path))
+        assert cache is not None and cache.cache_dir == Path(tmp_path)
+
+
+class TestConvertImagesToTextWithCache:
+    def _run(self, images_dir, out_file, cache_dir, http_mock, model_repeats=(("ocr/model", 1),), no_resume=False):
+        with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+             patch("pdf2anki.pic2text._http_post", http_mock), \
+             patch("pdf2anki.pic2text.time.sleep"):
+            convert_images_to_text(
+                images_dir=str(images_dir),
+                output_file=str(out_file),
+                model_repeats=list(model_repeats),
+                max_page_attempts=2,
+                no_resume=no_resume,
+                cache_dir=str(cache_dir),
+            )
+
+    def test_second_run_is_served_from_cache(self, tmp_path, cache_enabled):
+        images = tmp_path / "imgs"
+        images.mkdir()
+        make_png_image(images, "page_1.png")
+        cache_dir = tmp_path / "cache"
+
+        first = MagicMock(return_value=make_mock_ocr_response("Cached page text."))
+        self._run(images, tmp_path / "a.txt", cache_dir, first)
+        assert first.call_count == 1
+
+        second = MagicMock(side_effect=AssertionError("OCR API must not be called"))
+        self._run(images, tmp_path / "b.txt", cache_dir, second)
+        assert second.call_count == 0
+        assert "Cached page text." in (tmp_path / "b.txt").read_text(encoding="utf-8")
+
+    def test_no_resume_skips_cache_reads_but_refreshes_entries(self, tmp_path, cache_enabled):
+        images = tmp_path / "imgs"
+        images.mkdir()
+        make_png_image(images, "page_1.png")
+        cache_dir = tmp_path / "cache"
+
+        self._run(images, tmp_path / "a.txt", cache_dir, MagicMock(return_value=make_mock_ocr_response("Old text.")))
+
+        fresh = MagicMock(return_value=make_mock_ocr_response("New text."))
+        self._run(images, tmp_path / "b.txt", cache_dir, fresh, no_resume=True)
+        assert fresh.call_count == 1
+        assert "New text." in (tmp_path / "b.txt").read_text(encoding="utf-8")
+
+        replay = MagicMock(side_effect=AssertionError("OCR API must not be called"))
+        self._run(images, tmp_path / "c.txt", cache_dir, replay)
+        assert "New text." in (tmp_path / "c.txt").read_text(encoding="utf-8")
+
+    def test_error_responses_are_not_cached(self, tmp_path, cache_enabled):
+        import requests as req_lib
+        from pdf2anki.pic2text import OCRPauseException
+
+        images = tmp_path / "imgs"
+        images.mkdir()
+        make_png_image(images, "page_1.png")
+        cache_dir = tmp_path / "cache"
+
+        failing = MagicMock(side_effect=req_lib.exceptions.Timeout("timeout"))
+        with pytest.raises(OCRPauseException):
+            self._run(images, tmp_path / "a.txt", cache_dir, failing, no_resume=True)
+
+        assert not any(cache_dir.rglob("*.txt"))
+
+    def test_no_cache_flag_bypasses_cache(self, tmp_path, cache_enabled):
+        images = tmp_path / "imgs"
+        images.mkdir()
+        make_png_image(images, "page_1.png")
+        cache_dir = tmp_path / "cache"
+
+        http = MagicMock(return_value=make_mock_ocr_response("Text."))
+        with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+             patch("pdf2anki.pic2text._http_post", http), \
+             patch("pdf2anki.pic2text.time.sleep"):
+            for name in ("a.txt", "b.txt"):
+                convert_images_to_text(
+                    images_dir=str(images),
+                    output_file=str(tmp_path / name),
+                    model_repeats=[("ocr/model", 1)],
+                    no_resume=True,
+                    use_cache=False,
+                    cache_dir=str(cache_dir),
+                )
+
+        assert http.call_count == 2
+        assert not cache_dir.exists()
+
+    def test_judge_verdict_is_replayed_on_rerun(self, tmp_path, cache_enabled):
+        images = tmp_path / "imgs"
+        images.mkdir()
+        make_png_image(images, "page_1.png")
+        cache_dir = tmp_path / "cache"
+
+        def fake_post(url, headers, data, timeout):
+            if headers.get("X-Title") == "pdf2anki-judge":
+                return make_mock_ocr_response("Judged text.")
+            return make_mock_ocr_response("Candidate text.")
+
+        def run(out_name, http):
+            with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+                 patch("pdf2anki.pic2text._http_post", http), \
+                 patch("pdf2anki.pic2text.time.sleep"):
+                convert_images_to_text(
+                    images_dir=str(images),
+                    output_file=str(tmp_path / out_name),
+                    model_repeats=[("ocr/model", 2)],
+                    judge_model="judge/model",
+                    cache_dir=str(cache_dir),
+                )
+
+        first = MagicMock(side_effect=fake_post)
+        run("a.txt", first)
+        assert first.call_count == 3  # two OCR samples + one judge call
+
+        second = MagicMock(side_effect=AssertionError("no API call expected"))
+        run("b.txt", second)
+        assert second.call_count == 0
+        assert "Judged text." in (tmp_path / "b.txt").read_text(encoding="utf-8")
+
+    def test_no_resume_rejudges(self, tmp_path, cache_enabled):
+        images = tmp_path / "imgs"
+        images.mkdir()
+        make_png_image(images, "page_1.png")
+        cache_dir = tmp_path / "cache"
+        judge_calls = []
+
+        def fake_post(url, headers, data, timeout):
+            if headers.get("X-Title") == "pdf2anki-judge":
+                judge_calls.append(1)
+                return make_mock_ocr_response("Judged text.")
+            return make_mock_ocr_response("Candidate text.")
+
+        for out_name, no_resume in (("a.txt", False), ("b.txt", True)):
+            with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+                 patch("pdf2anki.pic2text._http_post", MagicMock(side_effect=fake_post)), \
+                 patch("pdf2anki.pic2text.time.sleep"):
+                convert_images_to_text(
+                    images_dir=str(images),
+                    output_file=str(tmp_path / out_name),
+                    model_repeats=[("ocr/model", 2)],
+                    judge_model="judge/model",
+                    no_resume=no_resume,
+                    cache_dir=str(cache_dir),
+                )
+
+        assert len(judge_calls) == 2
+
+
+class TestCacheCommand:
+    def test_info_and_clear(self, tmp_path, capsys):
+        from pdf2anki import core
+
+        cache = OCRCache(str(tmp_path))
+        cache.put("ab" * 16, "text")
+
+        core.cli_invoke(["cache", "info", "--cache-dir", str(tmp_path)])
+        assert "1 entries" in capsys.readouterr().out
+
+        core.cli_invoke(["cache", "clear", "--cache-dir", str(tmp_path)])
+        assert "Removed 1 entries" in capsys.readouterr().out
+        assert cache.usage() == (0, 0)
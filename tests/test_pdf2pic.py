@@ -1,11 +1,14 @@
 """Tests for pdf2anki.pdf2pic — pdf-to-image conversion."""
 import os
 import pytest
+import pymupdf
 from unittest.mock import MagicMock, patch, call
 
 from pdf2anki.pdf2pic import (
     parse_rectangle,
     _is_usable_image_file,
+    _clip_rects,
+    _fit_page_to_budget,
     find_acceptable_dpi,
     convert_pdf_to_images,
     create_recrop_pdf,
@@ -23,6 +26,13 @@ class TestParseRectangle:
     def test_zeros(self):
         assert parse_rectangle("0,0,0,0") == (0, 0, 0, 0)
 
+    def test_whitespace_around_coords_allowed(self):
+        assert parse_rectangle(" 10, 20 ,100 , 200 ") == (10, 20, 100, 200)
+
+    def test_float_coords_raise(self):
+        with pytest.raises(ValueError):
+            parse_rectangle("10.5,20,100,200")
+
     def test_too_few_coords_raises(self):
         with pytest.raises(ValueError):
             parse_rectangle("10,20,100")
@@ -114,6 +124,41 @@ class TestFindAcceptableDpi:
         assert result <= 300
 
 
+class TestFitPageToBudget:
+    def _run(self, size_kb_at, initial_dpi=300):
+        """Run with a fake encoder whose output size is size_kb_at(dpi) KB."""
+        probes = []
+
+        def fake_encode(page, dpi, pil_format, save_options):
+            probes.append(dpi)
+            return b"x" * int(size_kb_at(dpi) * 1024)
+
+        with patch("pdf2anki.pdf2pic._encode_page", side_effect=fake_encode):
+            dpi, data = _fit_page_to_budget(MagicMock(), initial_dpi)
+        return dpi, len(data) / 1024, probes
+
+    def test_page_that_fits_is_encoded_once(self):
+        dpi, size_kb, probes = self._run(lambda dpi: 500)
+        assert (dpi, probes) == (300, [300])
+        assert size_kb == 500
+
+    def test_large_page_converges_into_size_band(self):
+        dpi, size_kb, probes = self._run(lambda dpi: 3000 * (dpi / 300) ** 2)
+        assert 750 <= size_kb < 800
+        assert dpi < 300
+        assert len(probes) <= 3
+
+    def test_returned_bytes_belong_to_returned_dpi(self):
+        dpi, size_kb, _ = self._run(lambda dpi: 1000 * (dpi / 300) ** 1.5)
+        assert size_kb == int(1000 * (dpi / 300) ** 1.5 * 1024) / 1024
+
+    def test_page_too_large_at_any_dpi_keeps_initial_dpi(self):
+        dpi, size_kb, probes = self._run(lambda dpi: 5000)
+        assert dpi == 300
+        assert size_kb == 5000
+        assert len(probes) <= 8
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # convert_pdf_to_images — no rectangles
 # ─────────────────────────────────────────────────────────────────────────────
@@ -142,7 +187,7 @@ class TestConvertPdfToImages:
         with patch("pdf2anki.pdf2pic.pymupdf") as mock_pymupdf, \
              patch("pdf2anki.pdf2pic.fitz") as mock_fitz, \
              patch("pdf2anki.pdf2pic.Image") as mock_image, \
-             patch("pdf2anki.pdf2pic.find_acceptable_dpi", return_value=150), \
+             patch("pdf2anki.pdf2pic._fit_page_to_budget", return_value=(150, b"page")), \
              patch("pdf2anki.pdf2pic.os.path.getsize", return_value=760 * 1024):
             mock_pymupdf.open.return_value = mock_pdf
             mock_fitz.Matrix.return_value = MagicMock()
@@ -172,7 +217,7 @@ class TestConvertPdfToImages:
         with patch("pdf2anki.pdf2pic.pymupdf") as mock_pymupdf, \
              patch("pdf2anki.pdf2pic.fitz"), \
              patch("pdf2anki.pdf2pic.Image") as mock_image, \
-             patch("pdf2anki.pdf2pic.find_acceptable_dpi", return_value=150):
+             patch("pdf2anki.pdf2pic._fit_page_to_budget", return_value=(150, b"page")):
             mock_pymupdf.open.return_value = mock_pdf
             mock_image.frombytes.return_value = MagicMock()
 
@@ -186,6 +231,108 @@ class TestConvertPdfToImages:
         assert len(result) == 1
         assert result[0].endswith("page_1.png")
 
+    def test_webp_format_renders_real_webp_pages(self, tmp_path):
+        from PIL import Image as PILImage
+
+        pdf_path = tmp_path / "doc.pdf"
+        doc = pymupdf.open()
+        doc.new_page(width=144, height=144).insert_text((20, 40), "WebP page")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        result = convert_pdf_to_images(str(pdf_path), str(tmp_path / "out"), target_dpi=72, image_format="webp")
+
+        assert [os.path.basename(p) for p in result] == ["page_1.webp"]
+        with PILImage.open(result[0]) as img:
+            assert img.format == "WEBP"
+
+    def test_jpeg_format_renders_real_jpeg_pages(self, tmp_path):
+        from PIL import Image as PILImage
+
+        pdf_path = tmp_path / "doc.pdf"
+        doc = pymupdf.open()
+        doc.new_page(width=144, height=144).insert_text((20, 40), "JPEG page")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        result = convert_pdf_to_images(str(pdf_path), str(tmp_path / "out"), target_dpi=72, image_format="jpeg")
+
+        assert [os.path.basename(p) for p in result] == ["page_1.jpg"]
+        with PILImage.open(result[0]) as img:
+            assert img.format == "JPEG"
+
+    def test_grey_png_pages_are_saved_as_greyscale(self, tmp_path):
+        from PIL import Image as PILImage
+
+        pdf_path = tmp_path / "doc.pdf"
+        doc = pymupdf.open()
+        doc.new_page(width=144, height=144).insert_text((20, 40), "Black text")
+        doc.new_page(width=144, height=144).draw_rect(pymupdf.Rect(10, 10, 100, 100), fill=(1, 0, 0))
+        doc.save(str(pdf_path))
+        doc.close()
+
+        result = convert_pdf_to_images(str(pdf_path), str(tmp_path / "out"), target_dpi=72)
+
+        modes = []
+        for path in result:
+            with PILImage.open(path) as img:
+                modes.append(img.mode)
+        assert modes == ["L", "RGB"]
+
+    def test_render_workers_match_sequential_output(self, tmp_path):
+        pdf_path = tmp_path / "doc.pdf"
+        doc = pymupdf.open()
+        for n in range(1, 4):
+            doc.new_page(width=144, height=144).insert_text((20, 40), f"Page {n}")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        serial = convert_pdf_to_images(str(pdf_path), str(tmp_path / "serial"), target_dpi=72)
+        parallel = convert_pdf_to_images(str(pdf_path), str(tmp_path / "parallel"), target_dpi=72, render_workers=2)
+
+        assert [os.path.basename(p) for p in parallel] == ["page_1.png", "page_2.png", "page_3.png"]
+        for a, b in zip(serial, parallel):
+            with open(a, "rb") as fa, open(b, "rb") as fb:
+                assert fa.read() == fb.read()
+
+    def test_resume_reuses_page_in_other_format(self, tmp_path):
+        """Switching --image-format on resume must not add a second image of the same page."""
+        from PIL import Image as PILImage
+
+        PILImage.new("RGB", (10, 10)).save(str(tmp_path / "page_1.png"))
+        mock_pdf = self._build_pdf_mock(num_pages=1)
+
+        with patch("pdf2anki.pdf2pic.pymupdf") as mock_pymupdf, \
+             patch("pdf2anki.pdf2pic._fit_page_to_budget") as mock_find:
+            mock_pymupdf.open.return_value = mock_pdf
+            result = convert_pdf_to_images(
+                "fake.pdf", str(tmp_path), target_dpi=150,
+                resume_existing=True, image_format="webp",
+            )
+
+        assert result == [str(tmp_path / "page_1.png")]
+        mock_find.assert_not_called()
+        assert not (tmp_path / "page_1.webp").exists()
+
+    def test_rerender_in_other_format_removes_stale_page(self, tmp_path):
+        """Without resume, a new --image-format replaces the page's old image."""
+        from PIL import Image as PILImage
+
+        PILImage.new("RGB", (10, 10)).save(str(tmp_path / "page_1.png"))
+        PILImage.new("RGB", (10, 10)).save(str(tmp_path / "page_1.jpeg"))
+        mock_pdf = self._build_pdf_mock(num_pages=1)
+
+        with patch("pdf2anki.pdf2pic.pymupdf") as mock_pymupdf, \
+             patch("pdf2anki.pdf2pic._fit_page_to_budget", return_value=(150, b"page")):
+            mock_pymupdf.open.return_value = mock_pdf
+            result = convert_pdf_to_images(
+                "fake.pdf", str(tmp_path), target_dpi=150,
+                resume_existing=False, image_format="webp",
+            )
+
+        assert result == [str(tmp_path / "page_1.webp")]
+        assert sorted(os.listdir(tmp_path)) == ["page_1.webp"]
+
     def test_output_dir_created_if_missing(self, tmp_path):
         new_dir = str(tmp_path / "subdir" / "images")
         mock_pdf = self._build_pdf_mock(num_pages=1)
@@ -193,7 +340,7 @@ class TestConvertPdfToImages:
         with patch("pdf2anki.pdf2pic.pymupdf") as mock_pymupdf, \
              patch("pdf2anki.pdf2pic.fitz"), \
              patch("pdf2anki.pdf2pic.Image") as mock_image, \
-             patch("pdf2anki.pdf2pic.find_acceptable_dpi", return_value=72):
+             patch("pdf2anki.pdf2pic._fit_page_to_budget", return_value=(72, b"page")):
             mock_pymupdf.open.return_value = mock_pdf
             mock_image.frombytes.return_value = MagicMock()
 
@@ -210,6 +357,7 @@ class TestConvertPdfToImages:
 
         mock_page = MagicMock()
         mock_page.get_pixmap.return_value = mock_pix
+        mock_page.rect = pymupdf.Rect(0, 0, 72, 96)  # 300x400 px at 300 dpi
 
         mock_pdf = MagicMock()
         mock_pdf.__len__ = lambda self: 1
@@ -220,7 +368,7 @@ class TestConvertPdfToImages:
         with patch("pdf2anki.pdf2pic.pymupdf") as mock_pymupdf, \
              patch("pdf2anki.pdf2pic.fitz") as mock_fitz, \
              patch("pdf2anki.pdf2pic.Image") as mock_image, \
-             patch("pdf2anki.pdf2pic.create_recrop_pdf"):
+             patch("pdf2anki.pdf2pic.create_recrop_pdf") as mock_recrop:
             mock_pymupdf.open.return_value = mock_pdf
             mock_fitz.Matrix.return_value = MagicMock()
             mock_img = MagicMock()
@@ -238,6 +386,38 @@ class TestConvertPdfToImages:
 
         assert len(result) == 1
         assert "crop" in result[0]
+        # The crop is rendered via clip; the full page is never cropped in Pillow.
+        mock_img.crop.assert_not_called()
+        # Rects map to PDF points analytically: no full-page render at target_dpi.
+        assert mock_page.get_pixmap.call_count == 1
+        assert "clip" in mock_page.get_pixmap.call_args.kwargs
+        clip_args = mock_fitz.Rect.call_args_list[-1].args
+        assert clip_args == (0.0, 0.0, 36.0, 48.0)
+        # recrop.pdf is opt-in.
+        mock_recrop.assert_not_called()
+
+    def test_recrop_pdf_written_on_request(self, tmp_path):
+        pdf_path = tmp_path / "doc.pdf"
+        doc = pymupdf.open()
+        doc.new_page(width=144, height=144).insert_text((20, 40), "Crop me")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        result = convert_pdf_to_images(
+            str(pdf_path), str(tmp_path / "out"), rectangles=[(0, 0, 300, 300)], emit_recrop_pdf=True,
+        )
+
+        assert [os.path.basename(p) for p in result] == ["page_1_crop_1.jpg"]
+        assert (tmp_path / "out" / "doc_recrop.pdf").exists()
+
+
+class TestClipRects:
+    def test_maps_pixels_to_points_and_clamps_to_page(self):
+        clips = _clip_rects((0.0, 0.0, 72.0, 96.0), ((0, 0, 150, 200), (-10, 100, 1000, 1000)), 300)
+        assert clips == ((0.0, 0.0, 36.0, 48.0), (0.0, 24.0, 72.0, 96.0))
+
+    def test_offset_page_origin(self):
+        assert _clip_rects((10.0, 20.0, 82.0, 116.0), ((0, 0, 300, 300),), 300) == ((10.0, 20.0, 82.0, 92.0),)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -278,3 +458,25 @@ class TestCreateRecropPdf:
 
         # Landscape: width=842, height=595
         mock_doc.new_page.assert_called_once_with(width=842, height=595)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# extract_text_layer
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestExtractTextLayer:
+    def test_only_pages_above_threshold_are_returned(self, tmp_path):
+        from pdf2anki.pdf2pic import extract_text_layer
+
+        pdf_path = tmp_path / "mixed.pdf"
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), "Born digital page with plenty of text")
+        doc.new_page()  # "scanned" page: no text layer at all
+        doc.new_page().insert_text((72, 72), "ab")
+        doc.save(str(pdf_path))
+        doc.close()
+
+        pages = extract_text_layer(str(pdf_path), min_chars=20)
+
+        assert list(pages) == [1]
+        assert "Born digital page" in pages[1]
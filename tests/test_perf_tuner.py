@@ -46,6 +46,24 @@ class TestColdStart:
         assert tuner_with_tmp_home.resolve_concurrency("foo/bar", 1) == 1
 
 
+class TestEnvConcurrency:
+    def test_env_pins_level_when_no_flag(self, tuner_with_tmp_home, monkeypatch):
+        monkeypatch.setenv("PDF2ANKI_OCR_CONCURRENCY", "7")
+        assert tuner_with_tmp_home.resolve_concurrency("foo/bar", None) == 7
+        assert tuner_with_tmp_home.tuner_decides(None) is False
+
+    def test_explicit_flag_beats_env(self, tuner_with_tmp_home, monkeypatch):
+        monkeypatch.setenv("PDF2ANKI_OCR_CONCURRENCY", "7")
+        assert tuner_with_tmp_home.resolve_concurrency("foo/bar", 2) == 2
+
+    @pytest.mark.parametrize("raw", ["", "0", "-3", "many"])
+    def test_invalid_env_falls_back_to_tuner(self, tuner_with_tmp_home, monkeypatch, raw):
+        monkeypatch.setenv("PDF2ANKI_OCR_CONCURRENCY", raw)
+        assert tuner_with_tmp_home.env_concurrency() is None
+        assert tuner_with_tmp_home.tuner_decides(None) is True
+        assert tuner_with_tmp_home.resolve_concurrency("foo/bar", None) == tuner_with_tmp_home.COLD_START_CONCURRENCY
+
+
 class TestDisabled:
     def test_disabled_returns_seed(self, monkeypatch):
         monkeypatch.setenv("PDF2ANKI_DISABLE_TUNER", "1")
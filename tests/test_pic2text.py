@@ -721,6 +721,33 @@ class TestSequentialRegressionBaseline:
 
         assert "Success on retry" in Path(out).read_text(encoding="utf-8")
 
+    def test_retries_reuse_encoded_page(self, tmp_path):
+        """The page is base64-encoded once, not once per retry cycle."""
+        import requests as req_lib
+        from pdf2anki import pic2text
+
+        _create_page_images(tmp_path, 1)
+        out = str(tmp_path / "output.txt")
+        responses = [
+            req_lib.exceptions.Timeout("t"),
+            req_lib.exceptions.Timeout("t"),
+            "Success on third cycle",
+        ]
+
+        with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+             patch("pdf2anki.pic2text._http_post",
+                   side_effect=_sequential_side_effect(responses)), \
+             patch("pdf2anki.pic2text.time.sleep"), \
+             patch("pdf2anki.pic2text._image_to_base64",
+                   wraps=pic2text._image_to_base64) as encode:
+            convert_images_to_text(
+                images_dir=str(tmp_path), output_file=out,
+                model_repeats=[("m", 1)], max_page_attempts=5,
+            )
+
+        assert "Success on third cycle" in Path(out).read_text(encoding="utf-8")
+        assert encode.call_count == 1
+
     def test_failed_page_absent_from_output(self, tmp_path):
         """A page that never succeeds does NOT appear in the output."""
         import requests as req_lib
@@ -1117,6 +1144,72 @@ class TestPageLevelParallelismSpec:
         assert len(sections) == 20
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Text-layer pages: prefilled from the PDF, never sent to OCR
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestTextLayerPages:
+    def test_text_layer_pages_skip_ocr(self, tmp_path):
+        _create_page_images(tmp_path, 2)
+        out_file = tmp_path / "out.txt"
+        http = MagicMock(return_value=make_mock_ocr_response("OCR text for page 2"))
+
+        with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+             patch("pdf2anki.pic2text._http_post", http), \
+             patch("pdf2anki.pic2text.time.sleep"):
+            convert_images_to_text(
+                images_dir=str(tmp_path),
+                output_file=str(out_file),
+                model_repeats=[("ocr/model", 1)],
+                text_layer_pages={1: "Embedded text of page 1"},
+            )
+
+        assert http.call_count == 1
+        sections = _parse_output_sections(out_file)
+        assert sections["page_1.png"] == "Embedded text of page 1"
+        assert sections["page_2.png"] == "OCR text for page 2"
+
+    def test_text_layer_pages_skip_ocr_with_no_resume(self, tmp_path, capsys):
+        _create_page_images(tmp_path, 2)
+        out_file = tmp_path / "out.txt"
+        http = MagicMock(return_value=make_mock_ocr_response("OCR text for page 2"))
+
+        with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+             patch("pdf2anki.pic2text._http_post", http), \
+             patch("pdf2anki.pic2text.time.sleep"):
+            convert_images_to_text(
+                images_dir=str(tmp_path),
+                output_file=str(out_file),
+                model_repeats=[("ocr/model", 1)],
+                no_resume=True,
+                text_layer_pages={1: "LAYER TEXT"},
+            )
+
+        assert http.call_count == 1
+        sections = _parse_output_sections(out_file)
+        assert sections["page_1.png"] == "LAYER TEXT"
+        assert sections["page_2.png"] == "OCR text for page 2"
+        assert "3/2" not in capsys.readouterr().out
+
+    def test_crops_are_not_prefilled(self, tmp_path):
+        make_png_image(tmp_path, "page_1_crop_1.jpg")
+        out_file = tmp_path / "out.txt"
+        http = MagicMock(return_value=make_mock_ocr_response("Crop OCR"))
+
+        with patch("pdf2anki.pic2text.OPENROUTER_API_KEY", "fake-key"), \
+             patch("pdf2anki.pic2text._http_post", http), \
+             patch("pdf2anki.pic2text.time.sleep"):
+            convert_images_to_text(
+                images_dir=str(tmp_path),
+                output_file=str(out_file),
+                model_repeats=[("ocr/model", 1)],
+                text_layer_pages={1: "Full page text"},
+            )
+
+        assert http.call_count == 1
+        assert "Crop OCR" in out_file.read_text(encoding="utf-8")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Judge-pending: a failed/missing judge must NOT silently pass as "done"
 # ─────────────────────────────────────────────────────────────────────────────